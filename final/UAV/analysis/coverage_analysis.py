@@ -8,6 +8,7 @@ import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
 import sys
 import os
+import json
 
 # Importar configuraciones y sistema
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -19,6 +20,13 @@ class CoverageAnalysis:
     Análisis completo de cobertura 2D con mapas de throughput y LoS/NLoS
     """
     
+    # Registro por punto del grid (SoA compacto, apto para np.memmap)
+    POINT_DTYPE = np.dtype([
+        ('x', 'f4'), ('y', 'f4'),
+        ('throughput', 'f4'), ('los', 'f4'), ('path_loss', 'f4'),
+        ('spectral_efficiency', 'f4'), ('num_paths', 'f4')
+    ])
+    
     def __init__(self, grid_resolution=15, coverage_range=300, optimal_height=50):
         """
         Inicializar análisis de cobertura
@@ -64,22 +72,32 @@ class CoverageAnalysis:
         
         print(f"🗺️  Grid generado: {len(self.x_flat)} posiciones")
     
-    def run_coverage_sweep(self, fixed_snr_db=20):
-        """Ejecutar sweep completo de cobertura 2D"""
+    def run_coverage_sweep(self, fixed_snr_db=20, points_path=None):
+        """
+        Ejecutar sweep completo de cobertura 2D
+        
+        Args:
+            fixed_snr_db: SNR fijo para todos los puntos
+            points_path: Archivo .dat opcional; los puntos se escriben directamente
+                         a disco (np.memmap) y se genera un manifiesto JSON al lado
+        """
         print(f"\n🗺️  INICIANDO SWEEP DE COBERTURA...")
         print(f"📡 SNR fijo: {fixed_snr_db} dB")
         
-        # Initialize results
-        throughput_grid = np.zeros(len(self.x_flat))
-        los_grid = np.zeros(len(self.x_flat))
-        path_loss_grid = np.zeros(len(self.x_flat))
-        num_paths_grid = np.zeros(len(self.x_flat))
-        spectral_efficiency_grid = np.zeros(len(self.x_flat))
+        total_points = len(self.x_flat)
+        
+        # Initialize results (en disco si se indica archivo)
+        if points_path is not None:
+            os.makedirs(os.path.dirname(points_path) or '.', exist_ok=True)
+            points = np.memmap(points_path, dtype=self.POINT_DTYPE, mode='w+', shape=(total_points,))
+        else:
+            points = np.zeros(total_points, dtype=self.POINT_DTYPE)
+        points['x'] = self.x_flat
+        points['y'] = self.y_flat
         
         # Original position backup
         original_pos = ScenarioConfig.UAV1_POSITION.copy()
         
-        total_points = len(self.x_flat)
         print_interval = max(1, total_points // 10)  # Print every 10%
         
         for i, (x, y) in enumerate(zip(self.x_flat, self.y_flat)):
@@ -100,32 +118,31 @@ class CoverageAnalysis:
             
             # Simulate at fixed SNR
             metrics = self.system._simulate_single_snr(fixed_snr_db)
+            conditions = metrics.channel_condition
             
-            # Store results
-            throughput_grid[i] = metrics['throughput_mbps']
-            path_loss_grid[i] = -metrics['channel_gain_db']  # Convert to path loss
-            spectral_efficiency_grid[i] = metrics['spectral_efficiency']
-            
-            # LoS analysis
-            if metrics['channel_condition'] and metrics['channel_condition']['is_los']:
-                los_grid[i] = 1.0
-            else:
-                los_grid[i] = 0.0
-            
-            # Number of paths
-            if metrics['channel_condition']:
-                num_paths_grid[i] = metrics['channel_condition']['total_paths']
+            # Store results (LoS analysis + number of paths)
+            points[i] = (x, y,
+                         metrics.throughput_mbps,
+                         1.0 if conditions and conditions['is_los'] else 0.0,
+                         -metrics.channel_gain_db,  # Convert to path loss
+                         metrics.spectral_efficiency,
+                         conditions['total_paths'] if conditions else 0)
         
         # Restore original position
         self.system.scenario.move_uav("UAV1", original_pos)
         
+        if points_path is not None:
+            points.flush()
+            self._write_points_manifest(points_path, total_points, fixed_snr_db)
+        
         # Reshape results to grid
+        grid_shape = (self.grid_resolution, self.grid_resolution)
         self.results = {
-            'throughput_map': throughput_grid.reshape(self.grid_resolution, self.grid_resolution),
-            'los_map': los_grid.reshape(self.grid_resolution, self.grid_resolution),
-            'path_loss_map': path_loss_grid.reshape(self.grid_resolution, self.grid_resolution),
-            'spectral_efficiency_map': spectral_efficiency_grid.reshape(self.grid_resolution, self.grid_resolution),
-            'num_paths_map': num_paths_grid.reshape(self.grid_resolution, self.grid_resolution),
+            'throughput_map': np.array(points['throughput']).reshape(grid_shape),
+            'los_map': np.array(points['los']).reshape(grid_shape),
+            'path_loss_map': np.array(points['path_loss']).reshape(grid_shape),
+            'spectral_efficiency_map': np.array(points['spectral_efficiency']).reshape(grid_shape),
+            'num_paths_map': np.array(points['num_paths']).reshape(grid_shape),
             'X': self.X,
             'Y': self.Y,
             'fixed_snr_db': fixed_snr_db,
@@ -135,6 +152,24 @@ class CoverageAnalysis:
         print(f"✅ Sweep completado: {total_points} posiciones")
         return self.results
     
+    def _write_points_manifest(self, points_path, total_points, fixed_snr_db):
+        """Manifiesto JSON con lo necesario para reabrir el memmap de puntos"""
+        manifest = {
+            'points_file': os.path.basename(points_path),
+            'dtype': self.POINT_DTYPE.descr,
+            'shape': [total_points],
+            'grid_resolution': self.grid_resolution,
+            'coverage_range': self.coverage_range,
+            'optimal_height': self.optimal_height,
+            'fixed_snr_db': fixed_snr_db
+        }
+        
+        manifest_path = os.path.splitext(points_path)[0] + '.json'
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        
+        print(f"✅ Puntos en disco: {points_path} (manifiesto: {manifest_path})")
+    
     def analyze_coverage_statistics(self):
         """Analizar estadísticas de cobertura"""
         if self.results is None:
@@ -378,7 +413,7 @@ def run_coverage_analysis():
     analysis = CoverageAnalysis(grid_resolution=12, coverage_range=250, optimal_height=50)
     
     # Run coverage sweep
-    results = analysis.run_coverage_sweep()
+    results = analysis.run_coverage_sweep(points_path="./UAV/outputs/coverage_points.dat")
     
     # Analyze statistics
     stats = analysis.analyze_coverage_statistics()
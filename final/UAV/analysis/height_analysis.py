@@ -49,7 +49,7 @@ class HeightAnalysis:
         print(f"\n🚁 INICIANDO SWEEP DE ALTURAS...")
         
         # Run the height analysis using the system's method
-        self.results = self.system.simulate_height_analysis(self.height_range)
+        self.results = self.system.simulate_height_analysis(self.height_range, verbose=True)
         
         print(f"✅ Sweep completado para {len(self.height_range)} alturas")
         
@@ -8,6 +8,8 @@ import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
 import sys
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from scipy.optimize import minimize_scalar
 import seaborn as sns
 
@@ -16,6 +18,101 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.system_config import *
 from systems.basic_system import BasicUAVSystem
 
+def _init_worker():
+    """
+    Inicializador de los procesos hijo: memoria GPU bajo demanda, para que
+    varios runtimes TF puedan compartir la GPU sin reservarla entera cada uno
+    """
+    for gpu in tf.config.list_physical_devices('GPU'):
+        try:
+            tf.config.experimental.set_memory_growth(gpu, True)
+        except RuntimeError as e:
+            print(f"GPU setup warning: {e}")
+
+def _run_single_mimo_config(config_name, config, snr_db, test_position):
+    """
+    Evaluar una configuración MIMO de forma aislada
+    Función de módulo para poder ejecutarse en un proceso independiente
+    """
+    print(f"\n🔧 Configuración: {config_name}")
+    print(f"   gNB: {config['gnb'][0]} antenas ({config['gnb'][1]}x{config['gnb'][2]})")
+    print(f"   UAV: {config['uav'][0]} antenas ({config['uav'][1]}x{config['uav'][2]})")
+    
+    try:
+        # Create temporary modified configs
+        original_gnb_config = AntennaConfig.GNB_CONFIG.copy()
+        original_uav_config = AntennaConfig.UAV_CONFIG.copy()
+        
+        # Modify antenna configurations
+        AntennaConfig.GNB_CONFIG.update({
+            'num_antennas': config['gnb'][0],
+            'array_rows': config['gnb'][1], 
+            'array_cols': config['gnb'][2]
+        })
+        AntennaConfig.UAV_CONFIG.update({
+            'num_antennas': config['uav'][0],
+            'array_rows': config['uav'][1],
+            'array_cols': config['uav'][2]
+        })
+        
+        # Initialize system with new config
+        system = BasicUAVSystem()
+        
+        # Move UAV to test position
+        system.scenario.move_uav("UAV1", test_position)
+        
+        # Get paths and simulate
+        paths = system.scenario.get_paths(max_depth=5)
+        system.paths = paths
+        
+        # Simulate at test SNR
+        metrics = system._simulate_single_snr(snr_db)
+        
+        # Calculate theoretical MIMO gain
+        mimo_gain_db = 10 * np.log10(min(config['gnb'][0], config['uav'][0]))
+        
+        # Calculate actual SNR with channel conditions
+        actual_snr_linear = 10**(snr_db/10)
+        channel_power_gain = 10**(metrics.channel_gain_db/10)
+        effective_snr_linear = actual_snr_linear * channel_power_gain
+        
+        # Shannon capacity with MIMO spatial streams
+        spatial_streams = min(config['gnb'][0], config['uav'][0])
+        theoretical_capacity = spatial_streams * np.log2(1 + effective_snr_linear)
+        actual_throughput = theoretical_capacity * RFConfig.BANDWIDTH_HZ / 1e6  # Convert to Mbps
+        
+        result = {
+            'throughput_mbps': actual_throughput,
+            'spectral_efficiency': theoretical_capacity,
+            'channel_gain_db': metrics.channel_gain_db,
+            'gnb_antennas': config['gnb'][0],
+            'uav_antennas': config['uav'][0],
+            'mimo_gain_db': mimo_gain_db,
+            'spatial_streams': spatial_streams,
+            'effective_snr_db': 10 * np.log10(effective_snr_linear),
+            'channel_condition': metrics.get('channel_condition', {})
+        }
+        
+        print(f"   ✅ Throughput: {actual_throughput:.1f} Mbps")
+        print(f"   ✅ MIMO gain: {mimo_gain_db:.1f} dB")
+        print(f"   ✅ Spatial streams: {spatial_streams}")
+        print(f"   ✅ Eficiencia: {theoretical_capacity:.2f} bits/s/Hz")
+        
+        # Restore original configuration
+        AntennaConfig.GNB_CONFIG.update(original_gnb_config)
+        AntennaConfig.UAV_CONFIG.update(original_uav_config)
+        
+    except Exception as e:
+        print(f"   ❌ Error en configuración {config_name}: {str(e)}")
+        result = {
+            'throughput_mbps': 0,
+            'spectral_efficiency': 0,
+            'channel_gain_db': -100,
+            'error': str(e)
+        }
+    
+    return result
+
 class BeamformingMIMOAnalysis:
     """
     Análisis completo de Beamforming y configuraciones MIMO
@@ -63,91 +160,35 @@ class BeamformingMIMOAnalysis:
         self.beamforming_results = {}
         self.optimal_configs = {}
     
-    def analyze_mimo_configurations(self, snr_db=20):
-        """Analizar diferentes configuraciones MIMO"""
+    def analyze_mimo_configurations(self, snr_db=20, max_workers=1):
+        """
+        Analizar diferentes configuraciones MIMO
+        
+        Args:
+            snr_db: SNR de prueba
+            max_workers: Procesos en paralelo (1 = ejecución secuencial; se limita al
+                         número de configuraciones y de CPUs). Cada proceso carga su
+                         propia escena y runtime TF, así que conviene un valor pequeño
+        """
         print(f"\n📡 ANÁLISIS DE CONFIGURACIONES MIMO")
         print(f"📶 SNR: {snr_db} dB")
         print(f"📍 Posición: {self.test_position}")
         
-        results = {}
-        
-        for config_name, config in self.mimo_configs.items():
-            print(f"\n🔧 Configuración: {config_name}")
-            print(f"   gNB: {config['gnb'][0]} antenas ({config['gnb'][1]}x{config['gnb'][2]})")
-            print(f"   UAV: {config['uav'][0]} antenas ({config['uav'][1]}x{config['uav'][2]})")
-            
-            try:
-                # Create temporary modified configs
-                original_gnb_config = AntennaConfig.GNB_CONFIG.copy()
-                original_uav_config = AntennaConfig.UAV_CONFIG.copy()
-                
-                # Modify antenna configurations
-                AntennaConfig.GNB_CONFIG.update({
-                    'num_antennas': config['gnb'][0],
-                    'array_rows': config['gnb'][1], 
-                    'array_cols': config['gnb'][2]
-                })
-                AntennaConfig.UAV_CONFIG.update({
-                    'num_antennas': config['uav'][0],
-                    'array_rows': config['uav'][1],
-                    'array_cols': config['uav'][2]
-                })
-                
-                # Initialize system with new config
-                system = BasicUAVSystem()
-                
-                # Move UAV to test position
-                system.scenario.move_uav("UAV1", self.test_position)
-                
-                # Get paths and simulate
-                paths = system.scenario.get_paths(max_depth=5)
-                system.paths = paths
-                
-                # Simulate at test SNR
-                metrics = system._simulate_single_snr(snr_db)
-                
-                # Calculate theoretical MIMO gain
-                mimo_gain_db = 10 * np.log10(min(config['gnb'][0], config['uav'][0]))
-                
-                # Calculate actual SNR with channel conditions
-                actual_snr_linear = 10**(snr_db/10)
-                channel_power_gain = 10**(metrics['channel_gain_db']/10)
-                effective_snr_linear = actual_snr_linear * channel_power_gain
-                
-                # Shannon capacity with MIMO spatial streams
-                spatial_streams = min(config['gnb'][0], config['uav'][0])
-                theoretical_capacity = spatial_streams * np.log2(1 + effective_snr_linear)
-                actual_throughput = theoretical_capacity * RFConfig.BANDWIDTH_HZ / 1e6  # Convert to Mbps
-                
-                results[config_name] = {
-                    'throughput_mbps': actual_throughput,
-                    'spectral_efficiency': theoretical_capacity,
-                    'channel_gain_db': metrics['channel_gain_db'],
-                    'gnb_antennas': config['gnb'][0],
-                    'uav_antennas': config['uav'][0],
-                    'mimo_gain_db': mimo_gain_db,
-                    'spatial_streams': spatial_streams,
-                    'effective_snr_db': 10 * np.log10(effective_snr_linear),
-                    'channel_condition': metrics.get('channel_condition', {})
-                }
-                
-                print(f"   ✅ Throughput: {actual_throughput:.1f} Mbps")
-                print(f"   ✅ MIMO gain: {mimo_gain_db:.1f} dB")
-                print(f"   ✅ Spatial streams: {spatial_streams}")
-                print(f"   ✅ Eficiencia: {theoretical_capacity:.2f} bits/s/Hz")
-                
-                # Restore original configuration
-                AntennaConfig.GNB_CONFIG.update(original_gnb_config)
-                AntennaConfig.UAV_CONFIG.update(original_uav_config)
-                
-            except Exception as e:
-                print(f"   ❌ Error en configuración {config_name}: {str(e)}")
-                results[config_name] = {
-                    'throughput_mbps': 0,
-                    'spectral_efficiency': 0,
-                    'channel_gain_db': -100,
-                    'error': str(e)
-                }
+        # Cada configuración es independiente: se puede evaluar en paralelo por procesos
+        max_workers = min(max_workers, len(self.mimo_configs), os.cpu_count() or 1)
+        
+        if max_workers <= 1:
+            results = {name: _run_single_mimo_config(name, config, snr_db, self.test_position)
+                       for name, config in self.mimo_configs.items()}
+        else:
+            # 'spawn' evita heredar el estado TF/Dr.Jit del proceso padre
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker) as pool:
+                futures = {name: pool.submit(_run_single_mimo_config, name, config,
+                                             snr_db, self.test_position)
+                           for name, config in self.mimo_configs.items()}
+                results = {name: future.result() for name, future in futures.items()}
         
         self.mimo_results = results
         return results
@@ -173,7 +214,7 @@ class BeamformingMIMOAnalysis:
         
         # Get base channel metrics
         base_metrics = system._simulate_single_snr(15)  # Reference SNR
-        base_channel_gain = base_metrics['channel_gain_db']
+        base_channel_gain = base_metrics.channel_gain_db
         
         for strategy in self.beamforming_strategies.keys():
             print(f"\n🔧 Estrategia: {strategy}")
@@ -31,6 +31,7 @@ class AntennaConfig:
         'pattern': 'iso',
         'polarization': 'V'
     }
+    GNB_NUM_ELEMENTS = GNB_ARRAY['num_rows'] * GNB_ARRAY['num_cols']
     
     # UAV - Array compacto
     UAV_ARRAY = {
@@ -41,6 +42,7 @@ class AntennaConfig:
         'pattern': 'iso',
         'polarization': 'V'
     }
+    UAV_NUM_ELEMENTS = UAV_ARRAY['num_rows'] * UAV_ARRAY['num_cols']
 
 # =============================================================================
 # POSICIONES 3D ESCENARIO
@@ -109,22 +111,25 @@ class VisualizationConfig:
 # =============================================================================
 # UTILIDADES
 # =============================================================================
+# Resumen evaluado una sola vez al importar (la configuración es estática)
+_CONFIG_SUMMARY = {
+    'frequency_ghz': RFConfig.FREQUENCY / 1e9,
+    'gnb_antennas': AntennaConfig.GNB_NUM_ELEMENTS,
+    'uav_antennas': AntennaConfig.UAV_NUM_ELEMENTS,
+    'coverage_area_m2': (ScenarioConfig.COVERAGE_AREA['x_range'][1] - 
+                         ScenarioConfig.COVERAGE_AREA['x_range'][0]) ** 2,
+    'height_range': f"{min(ScenarioConfig.HEIGHT_RANGE)}-{max(ScenarioConfig.HEIGHT_RANGE)}m",
+    'snr_range_db': f"{SimulationConfig.SNR_RANGE[0]}-{SimulationConfig.SNR_RANGE[-1]}"
+}
+
 def get_config_summary():
-    """Retorna resumen de configuración para logging"""
-    return {
-        'frequency_ghz': RFConfig.FREQUENCY / 1e9,
-        'gnb_antennas': AntennaConfig.GNB_ARRAY['num_rows'] * AntennaConfig.GNB_ARRAY['num_cols'],
-        'uav_antennas': AntennaConfig.UAV_ARRAY['num_rows'] * AntennaConfig.UAV_ARRAY['num_cols'],
-        'coverage_area_m2': (ScenarioConfig.COVERAGE_AREA['x_range'][1] - 
-                             ScenarioConfig.COVERAGE_AREA['x_range'][0]) ** 2,
-        'height_range': f"{min(ScenarioConfig.HEIGHT_RANGE)}-{max(ScenarioConfig.HEIGHT_RANGE)}m",
-        'snr_range_db': f"{SimulationConfig.SNR_RANGE[0]}-{SimulationConfig.SNR_RANGE[-1]}"
-    }
+    """Retorna resumen de configuración para logging (precalculado, no modificar)"""
+    return _CONFIG_SUMMARY
 
 if __name__ == "__main__":
     print("=== UAV 5G NR System Configuration ===")
     print(f"Frequency: {RFConfig.FREQUENCY/1e9:.1f} GHz")
-    print(f"gNB Array: {AntennaConfig.GNB_ARRAY['num_rows']}x{AntennaConfig.GNB_ARRAY['num_cols']} = {AntennaConfig.GNB_ARRAY['num_rows']*AntennaConfig.GNB_ARRAY['num_cols']} elements")
-    print(f"UAV Array: {AntennaConfig.UAV_ARRAY['num_rows']}x{AntennaConfig.UAV_ARRAY['num_cols']} = {AntennaConfig.UAV_ARRAY['num_rows']*AntennaConfig.UAV_ARRAY['num_cols']} elements") 
+    print(f"gNB Array: {AntennaConfig.GNB_ARRAY['num_rows']}x{AntennaConfig.GNB_ARRAY['num_cols']} = {AntennaConfig.GNB_NUM_ELEMENTS} elements")
+    print(f"UAV Array: {AntennaConfig.UAV_ARRAY['num_rows']}x{AntennaConfig.UAV_ARRAY['num_cols']} = {AntennaConfig.UAV_NUM_ELEMENTS} elements") 
     print(f"Coverage: {ScenarioConfig.COVERAGE_AREA['x_range'][1]*2}m x {ScenarioConfig.COVERAGE_AREA['y_range'][1]*2}m")
-    print(f"Height Range: {min(ScenarioConfig.HEIGHT_RANGE)}-{max(ScenarioConfig.HEIGHT_RANGE)}m")
\ No newline at end of file
+    print(f"Height Range: {_CONFIG_SUMMARY['height_range']}")
\ No newline at end of file
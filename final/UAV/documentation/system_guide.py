@@ -192,7 +192,8 @@ ESTRATEGIAS BEAMFORMING:
 6. SVD (Singular Value Decomposition)
 
 ALGORITMO:
-1. 📊 Calcula capacity Shannon: C = log2(det(I + H*H'/σ²))
+1. 📊 Calcula capacity Shannon: C = log2(det(I + H*H'/σ²)) = Σ log2(1 + s_i²/σ²)
+   (s_i = valores singulares de H: una sola SVD sirve para todo el barrido SNR)
 2. 🎯 Array gain: 10*log10(Nt*Nr)
 3. ⚡ Beamforming gain según estrategia
 4. 📈 Eficiencia espectral bits/s/Hz
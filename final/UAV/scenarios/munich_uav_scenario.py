@@ -12,6 +12,55 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.system_config import ScenarioConfig, AntennaConfig, RFConfig
 
+@tf.function(jit_compile=True, input_signature=[
+    tf.TensorSpec(None, tf.complex64),   # a:   [..., num_paths, num_time_steps]
+    tf.TensorSpec(None, tf.float32),     # tau: [..., num_paths]
+    tf.TensorSpec([None], tf.float32)    # frequencies
+])
+def _cfr_from_cir(a, tau, frequencies):
+    """
+    CFR H(f) = sum_p a_p exp(-j2*pi*f*tau_p)
+    Firma fija -> se traza una sola vez; XLA fusiona exp + broadcast + suma en un kernel
+    """
+    phase = tf.cast(-2.0 * np.pi, tf.float32) * tau[..., tf.newaxis] * frequencies
+    phase = tf.exp(tf.complex(tf.zeros_like(phase), phase))     # [..., num_paths, num_freq]
+    # [..., paths, time, 1] * [..., paths, 1, freq] -> sumar sobre paths
+    return tf.reduce_sum(a[..., tf.newaxis] * phase[..., tf.newaxis, :], axis=-3)
+
+@tf.function(jit_compile=True, input_signature=[
+    tf.TensorSpec([None, None, None, None, None], tf.float32)   # path_powers: [rx, rx_ant, tx, tx_ant, paths]
+])
+def _direct_ratio_kernel(path_powers):
+    """Fracción de potencia del primer path por receptor (media sobre antenas)"""
+    direct_power = path_powers[..., 0]
+    total_power = tf.reduce_sum(path_powers, axis=-1)
+    return tf.reduce_mean(direct_power / (total_power + 1e-12), axis=[1, 2, 3])
+
+class PathsInfo:
+    """
+    Metadatos de un objeto Paths (número de paths y forma de coeficientes)
+    Se calculan una vez y quedan cacheados en el propio objeto Paths
+    """
+    
+    def __init__(self, paths):
+        num_paths = getattr(paths, 'num_paths', None)
+        if num_paths is None:
+            shape = tuple(paths.a[0].shape)
+            num_paths = shape[-1] if shape else 0
+        self.num_paths = int(num_paths)
+    
+    @classmethod
+    def of(cls, paths):
+        """Obtener metadatos cacheados (o calcularlos la primera vez)"""
+        info = getattr(paths, '_paths_info', None)
+        if info is None:
+            info = cls(paths)
+            try:
+                paths._paths_info = info
+            except AttributeError:
+                pass  # Objeto sin __dict__: se recalcula en la siguiente consulta
+        return info
+
 class MunichUAVScenario:
     """
     Escenario 3D Munich con gNB y UAVs
@@ -67,6 +116,9 @@ class MunichUAVScenario:
         ))
         
         print(f"✅ UAV1: {ScenarioConfig.UAV1_POSITION} m")
+        
+        # Índice nombre -> receptor para resolver move_uav en O(1)
+        self._rx_by_name = {rx.name: rx for rx in self.scene.receivers.values()}
     
     def _setup_antenna_arrays(self):
         """Configurar arrays de antenas"""
@@ -115,27 +167,75 @@ class MunichUAVScenario:
         position_f32 = [float(x) for x in new_position]
         
         # Update receiver position
-        for rx in self.scene.receivers.values():
-            if rx.name == uav_name:
-                rx.position = position_f32
-                break
-        else:
+        rx = self._find_receiver(uav_name)
+        if rx is None:
             print(f"❌ UAV {uav_name} no encontrado")
             return False
         
+        rx.position = position_f32
         return True
     
+    def move_uavs_batched(self, uav_names, positions):
+        """Mover varios UAVs de una vez (positions: array Nx3)"""
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        
+        moved = 0
+        for uav_name, position in zip(uav_names, positions.tolist()):
+            rx = self._find_receiver(uav_name)
+            if rx is None:
+                print(f"❌ UAV {uav_name} no encontrado")
+                continue
+            rx.position = position
+            moved += 1
+        
+        return moved == len(positions)
+    
+    def _find_receiver(self, uav_name):
+        """Resolver receptor por nombre (refresca el índice si la escena cambió)"""
+        rx = self._rx_by_name.get(uav_name)
+        if rx is None:
+            self._rx_by_name = {r.name: r for r in self.scene.receivers.values()}
+            rx = self._rx_by_name.get(uav_name)
+        return rx
+    
     def get_paths(self, max_depth=5):
         """Calcular paths ray tracing"""
         print(f"📡 Calculando paths (max_depth={max_depth})...")
         
         paths = self.path_solver(self.scene, max_depth=max_depth)
         
-        num_paths = paths.a[0].shape[-1] if paths.a[0].shape else 0
+        num_paths = PathsInfo.of(paths).num_paths
         print(f"✅ {num_paths} paths calculados")
         
         return paths
-    
+
+    def get_paths_batch(self, positions, max_depth=5):
+        """
+        Ray tracing de varias posiciones UAV en una sola llamada al solver
+        Añade un receptor temporal por posición (positions: array Nx3) y los retira al final
+        Returns: (paths, rx_idx) con rx_idx los índices de receptor de cada posición
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        print(f"📡 Calculando paths para {len(positions)} posiciones (max_depth={max_depth})...")
+
+        names = [f"_UAV_batch_{i}" for i in range(len(positions))]
+        for name, position in zip(names, positions.tolist()):
+            self.scene.add(sionna.rt.Receiver(name=name, position=position))
+
+        try:
+            # El eje de receptores de paths sigue el orden de inserción de scene.receivers
+            rx_order = {name: i for i, name in enumerate(self.scene.receivers)}
+            rx_idx = np.array([rx_order[name] for name in names])
+            paths = self.path_solver(self.scene, max_depth=max_depth)
+        finally:
+            for name in names:
+                self.scene.remove(name)
+
+        num_paths = PathsInfo.of(paths).num_paths
+        print(f"✅ {num_paths} paths calculados")
+
+        return paths, rx_idx
+
     def get_channel_response(self, paths, bandwidth=RFConfig.BANDWIDTH, num_ofdm_subcarriers=64):
         """Obtener respuesta en frecuencia del canal"""
         print("📊 Calculando respuesta en frecuencia...")
@@ -145,14 +245,18 @@ class MunichUAVScenario:
             num_ofdm_subcarriers, 
             bandwidth / num_ofdm_subcarriers
         )
+        frequencies_tf = tf.constant(np.array(frequencies), dtype=tf.float32)
         
-        # Compute channel frequency response
-        h_freq = paths.cfr(
-            frequencies=frequencies,
-            num_time_steps=1,
-            normalize=False,  # Mantener path loss realista
-            out_type='tf'
-        )
+        # Extraer coeficientes y retardos como tensores TF planos
+        a, tau = paths.cir(num_time_steps=1, out_type='tf')
+        a = tf.cast(a, tf.complex64)
+        tau = tf.cast(tau, tf.float32)
+        if len(tau.shape) == 3:
+            # synthetic_array: tau [num_rx, num_tx, num_paths] -> alinear con ejes de antenas
+            tau = tau[:, tf.newaxis, :, tf.newaxis, :]
+        
+        # Compute channel frequency response (sin normalizar: mantener path loss realista)
+        h_freq = _cfr_from_cir(a, tau, frequencies_tf)
         
         print(f"✅ Channel shape: {h_freq.shape}")
         print(f"   [num_rx, num_rx_ant, num_tx, num_tx_ant, time_steps, frequencies]")
@@ -164,22 +268,25 @@ class MunichUAVScenario:
         print("🔍 Analizando condiciones del canal...")
         
         # Path powers (first path is usually LoS if exists)
-        path_powers = tf.abs(paths.a[0]) ** 2  # Shape: [num_rx, num_rx_ant, num_tx, num_tx_ant, num_paths]
+        # |z|^2 = Re(z * conj(z)): evita el sqrt implícito de tf.abs
+        z = tf.convert_to_tensor(paths.a[0])
+        path_powers = tf.math.real(z * tf.math.conj(z))  # Shape: [num_rx, num_rx_ant, num_tx, num_tx_ant, num_paths]
         total_power = tf.reduce_sum(path_powers, axis=-1)  # Sum over paths
         
+        num_paths = PathsInfo.of(paths).num_paths
+        
         # First path (direct) vs total power ratio
-        if path_powers.shape[-1] > 0:
+        if num_paths > 0:
             direct_power = path_powers[..., 0]  # First path
             direct_ratio = tf.reduce_mean(direct_power / (total_power + 1e-12))  # Average over antennas
             
+            # Convert to scalars: una sola transferencia device -> host para ambos escalares
+            direct_ratio_scalar, total_power_scalar = (
+                float(v) for v in tf.stack([direct_ratio, tf.reduce_mean(total_power)]).numpy())
+            
             # LoS threshold (first path dominates)
             los_threshold = 0.7
-            is_los = direct_ratio > los_threshold
-            
-            # Convert to scalars
-            direct_ratio_scalar = float(direct_ratio.numpy())
-            is_los_scalar = bool(is_los.numpy())
-            total_power_scalar = float(tf.reduce_mean(total_power).numpy())
+            is_los_scalar = direct_ratio_scalar > los_threshold
             
             print(f"✅ Direct path power ratio: {direct_ratio_scalar:.3f}")
             print(f"✅ Channel condition: {'LoS' if is_los_scalar else 'NLoS'}")
@@ -187,13 +294,27 @@ class MunichUAVScenario:
             return {
                 'is_los': is_los_scalar,
                 'direct_ratio': direct_ratio_scalar,
-                'total_paths': int(path_powers.shape[-1]),
+                'total_paths': num_paths,
                 'total_power_db': 10 * np.log10(total_power_scalar + 1e-12)
             }
         else:
             print("❌ No paths found")
             return None
-    
+
+    def analyze_los_per_receiver(self, paths, los_threshold=0.7):
+        """
+        Condición LoS por receptor (mismo criterio que analyze_channel_conditions)
+        Returns: array bool [num_rx]
+        """
+        if PathsInfo.of(paths).num_paths == 0:
+            return None
+
+        z = tf.convert_to_tensor(paths.a[0])
+        path_powers = tf.cast(tf.math.real(z * tf.math.conj(z)), tf.float32)
+        # Firma fija: una sola traza sirve para cualquier número de alturas/paths
+        direct_ratio = _direct_ratio_kernel(path_powers).numpy()
+        return direct_ratio > los_threshold
+
     def get_scenario_info(self):
         """Información del escenario actual"""
         return {
@@ -9,17 +9,194 @@ Simulación completa que cumple los requisitos exactos:
 - Impacto altura y velocidad
 """
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import json
 import os
-from scipy.special import erfc
+import math
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def _pyplot():
+    """Importar matplotlib sólo al generar plots (backend Agg, render a archivo)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401 (registra proyección '3d')
+    return plt
+
+# 10**(x/10) = exp(x·ln(10)/10): una multiplicación y un exp
+_LN10_OVER_10 = math.log(10.0) / 10.0
+
+# Abramowitz-Stegun 7.1.26: erfc(x) ≈ t·(a1 + t·(a2 + t·(a3 + t·(a4 + t·a5))))·e^(-x²),
+# t = 1/(1 + p·x), x >= 0. Error absoluto <= 1.5e-7; relativo < 0.3% para x <= 4
+# (BER >= 1e-8, el recorte de las curvas) y < 1.3% para x <= 6
+_AS_P = 0.3275911
+_AS_A1, _AS_A2, _AS_A3, _AS_A4, _AS_A5 = (0.254829592, -0.284496736, 1.421413741,
+                                          -1.453152027, 1.061405429)
+
+def _fast_erfc(x):
+    """Aproximación rápida de erfc para x >= 0 (Abramowitz-Stegun 7.1.26)"""
+    t = 1.0 / (1.0 + _AS_P * x)
+    poly = t * (_AS_A1 + t * (_AS_A2 + t * (_AS_A3 + t * (_AS_A4 + t * _AS_A5))))
+    return poly * np.exp(-np.square(x))
+
+def _ber_throughput_loop(snr_db, ber_scale, snr_factor, bandwidth_hz, fast_erfc):
+    """
+    Kernel fusionado SNR → BER/throughput (un solo bucle, sin temporales)
+    BER = ber_scale · erfc(sqrt(snr_lineal · snr_factor)), throughput Shannon en Mbps
+    """
+    n = snr_db.shape[0]
+    ber = np.empty(n)
+    throughput_mbps = np.empty(n)
+    for i in range(n):
+        snr_linear = math.exp(_LN10_OVER_10 * snr_db[i])
+        x = math.sqrt(snr_linear * snr_factor)
+        if fast_erfc:
+            t = 1.0 / (1.0 + _AS_P * x)
+            erfc_x = (t * (_AS_A1 + t * (_AS_A2 + t * (_AS_A3 + t * (_AS_A4 + t * _AS_A5))))
+                      * math.exp(-x * x))
+        else:
+            erfc_x = math.erfc(x)
+        ber[i] = min(max(ber_scale * erfc_x, 1e-8), 1.0)
+        throughput_mbps[i] = bandwidth_hz * math.log2(1.0 + snr_linear) / 1e6
+    return ber, throughput_mbps
+
+if NUMBA_AVAILABLE:
+    # Sin parallel=True: los análisis ya corren en hilos concurrentes y el threading
+    # layer de numba (workqueue) no admite lanzamientos paralelos desde varios hilos
+    _ber_throughput_kernel = njit(fastmath=True, nogil=True)(_ber_throughput_loop)
+else:
+    def _ber_throughput_kernel(snr_db, ber_scale, snr_factor, bandwidth_hz, fast_erfc):
+        """Versión NumPy del kernel (sin numba)"""
+        snr_linear = np.exp(_LN10_OVER_10 * snr_db)
+        x = np.sqrt(snr_linear * snr_factor)
+        if fast_erfc:
+            erfc_x = _fast_erfc(x)
+        else:
+            from scipy.special import erfc  # sólo para la erfc exacta vectorizada
+            erfc_x = erfc(x)
+        ber = ber_scale * erfc_x
+        throughput_mbps = bandwidth_hz * np.log2(1 + snr_linear) / 1e6
+        return np.clip(ber, 1e-8, 1.0), throughput_mbps
+
+# Trayectorias vectorizadas: cada función evalúa todos los instantes t de una vez
+# y retorna (x, y, z) como arrays
+def _circular_traj(t, start_xy, start_angle, center_xy, radius, alt, speed):
+    """Trayectoria circular alrededor del gNB"""
+    angle = start_angle + (speed / radius) * t
+    x = center_xy[0] + radius * np.cos(angle)
+    y = center_xy[1] + radius * np.sin(angle)
+    z = alt + 10 * np.sin(0.1 * t)  # Variación altura pequeña
+    return x, y, z
+
+def _linear_traj(t, start_xy, start_angle, center_xy, radius, alt, speed):
+    """Trayectoria lineal radial"""
+    x = start_xy[0] + speed * t * np.cos(start_angle)
+    y = start_xy[1] + speed * t * np.sin(start_angle)
+    z = np.full(t.shape, alt, dtype=float)
+    return x, y, z
+
+def _hovering_traj(t, start_xy, start_angle, center_xy, radius, alt, speed):
+    """Hovering con pequeñas variaciones"""
+    x = start_xy[0] + 5 * np.cos(0.5 * t)
+    y = start_xy[1] + 5 * np.sin(0.5 * t)
+    z = alt + 3 * np.sin(0.2 * t)
+    return x, y, z
+
+def _zigzag_traj(t, start_xy, start_angle, center_xy, radius, alt, speed):
+    """Patrón zigzag"""
+    x = start_xy[0] + speed * t * np.cos(start_angle)
+    y = start_xy[1] + 30 * np.sin(0.3 * t)  # Zigzag lateral
+    z = np.full(t.shape, alt, dtype=float)
+    return x, y, z
+
+_TRAJECTORY_FUNCS = {
+    'circular': _circular_traj,
+    'linear': _linear_traj,
+    'hovering': _hovering_traj,
+    'zigzag': _zigzag_traj
+}
+
+class _NpEncoder(json.JSONEncoder):
+    """Encoder JSON que convierte arrays/escalares numpy sólo al serializarlos"""
+    
+    def default(self, o):
+        if isinstance(o, np.ndarray):
+            return o.tolist()
+        if isinstance(o, np.floating):
+            return float(o)
+        if isinstance(o, np.integer):
+            return int(o)
+        return super().default(o)
+
+# Plantilla del reporte resumen (se rellena con str.format)
+_REPORT_TEMPLATE = """
+# 🎯 SIMULACIÓN UAV 5G NR - REPORTE OBJETIVO ESPECÍFICO
+
+## Configuración Simulación
+- **MIMO Masivo gNB**: {gnb_antennas} antenas
+- **UAVs configurados**: {num_uavs}
+- **Área simulación**: {area_size_m}m x {area_size_m}m
+- **Frecuencia**: {frequency_ghz} GHz
+
+## 📊 Resultados Principales
+
+### BER vs SNR
+- **Mejor configuración**: MIMO Masivo 64x4 (BER < 1e-6 @ SNR 20dB)
+- **Ganancia MIMO**: Factor 10⁴ mejora BER vs SISO
+- **Beamforming crítico**: SVD beamforming esencial para performance
+
+### Impacto Altura UAV
+- **Altura óptima**: ~100m (compromiso LoS/NLoS)
+- **Rango operacional**: 50-200m efectivo
+- **BER mínimo**: {min_ber:.2e}
+
+### Comparación LoS vs NLoS
+- **Resultado**: {interpretation}
+- **Factor ventaja**: {advantage_factor:.2f}x
+
+### Casos Estudio
+- **Directo UAV↔gNB**: Implementado ✅
+- **Relay UAV↔UAV↔gNB**: Implementado ✅
+- **Trayectorias 3D**: 4 patrones diferentes ✅
+
+## 🎯 Conclusiones Específicas
+1. **MIMO masivo fundamental** para BER objetivo
+2. **Altura 100m óptima** balance performance/regulación
+3. **Beamforming SVD** aporta 7dB ganancia crítica
+4. **NLoS puede superar LoS** con MIMO adecuado
+5. **Relay efectivo** para extensión cobertura
+
+*Simulación completada: {timestamp}*
+"""
 
 class UAVSpecificSimulation:
     """Simulación específica para objetivo original UAV 5G NR"""
     
-    def __init__(self):
-        """Inicializar simulación específica"""
+    def __init__(self, fast_erfc=True, seed=42):
+        """
+        Inicializar simulación específica
+        
+        Args:
+            fast_erfc: Usar la aproximación de erfc (Abramowitz-Stegun) en los cálculos BER
+            seed: Semilla del generador aleatorio (trayectorias y shadowing)
+        """
+        self.fast_erfc = fast_erfc
+        self._rng = np.random.default_rng(seed)
+        
+        # Figura de resultados cacheada (ver generate_results_plots)
+        self._fig = None
+        self._axes = None
+        self._plot_artists = None
+        self._plot_keys = None
         
         print("="*80)
         print("🎯 SIMULACIÓN UAV 5G NR - OBJETIVO ORIGINAL ESPECÍFICO")
@@ -45,6 +222,14 @@ class UAVSpecificSimulation:
             'bandwidth_mhz': 100
         }
         
+        # Constantes del balance de enlace (invariantes durante la simulación)
+        # FSPL: 32.45 + 20log10(f_GHz) + 20log10(d_km) = _pl_const + 20log10(d_m)
+        self._freq_pl_term = 20.0 * math.log10(self.scenario['frequency_ghz'])
+        self._pl_const = 32.45 + self._freq_pl_term - 60
+        self._noise_dbm = -174.0 + 10.0 * math.log10(self.scenario['bandwidth_mhz'] * 1e6)
+        self._mimo_gain_db = 10 * math.log10(self.mimo_config['gnb_antennas'] * self.mimo_config['uav_antennas'])
+        self._bf_gain_db = 7 if self.mimo_config['beamforming'] == 'SVD' else 0
+        
         # UAV configurations - VARIOS UAVS DIFERENTES ALTURAS
         self.uav_configs = [
             {'id': 'UAV_A', 'alt_m': 50,  'speed_mps': 10, 'trajectory': 'circular'},
@@ -65,56 +250,33 @@ class UAVSpecificSimulation:
         time_points = np.arange(0, duration_sec, time_step)
         trajectories = {}
         
-        for uav in self.uav_configs:
+        # Posiciones iniciales aleatorias en borde del área (un solo sorteo)
+        start_angles = self._rng.random(len(self.uav_configs)) * 2 * np.pi
+        
+        for uav, start_angle in zip(self.uav_configs, start_angles.tolist()):
             uav_id = uav['id']
             alt = uav['alt_m']
             speed = uav['speed_mps']
             traj_type = uav['trajectory']
             
-            # Posición inicial aleatoria en borde del área
-            start_angle = np.random.random() * 2 * np.pi
             start_radius = self.scenario['area_size_m'] * 0.3
             start_x = self.scenario['gnb_position'][0] + start_radius * np.cos(start_angle)
             start_y = self.scenario['gnb_position'][1] + start_radius * np.sin(start_angle)
             
-            positions = []
+            # Todos los instantes de la trayectoria en una sola evaluación
+            center_xy = self.scenario['gnb_position'][:2]
+            x, y, z = _TRAJECTORY_FUNCS[traj_type](
+                time_points, (start_x, start_y), start_angle, center_xy, start_radius, alt, speed)
             
-            for t in time_points:
-                if traj_type == 'circular':
-                    # Trayectoria circular
-                    angle = start_angle + (speed / start_radius) * t
-                    x = self.scenario['gnb_position'][0] + start_radius * np.cos(angle)
-                    y = self.scenario['gnb_position'][1] + start_radius * np.sin(angle)
-                    z = alt + 10 * np.sin(0.1 * t)  # Variación altura pequeña
-                    
-                elif traj_type == 'linear':
-                    # Trayectoria lineal
-                    direction = np.array([np.cos(start_angle), np.sin(start_angle)])
-                    pos_2d = np.array([start_x, start_y]) + speed * t * direction
-                    x, y = pos_2d
-                    z = alt
-                    
-                elif traj_type == 'hovering':
-                    # Hovering con pequeñas variaciones
-                    x = start_x + 5 * np.cos(0.5 * t)
-                    y = start_y + 5 * np.sin(0.5 * t)
-                    z = alt + 3 * np.sin(0.2 * t)
-                    
-                elif traj_type == 'zigzag':
-                    # Patrón zigzag
-                    x = start_x + speed * t * np.cos(start_angle)
-                    y = start_y + 30 * np.sin(0.3 * t)  # Zigzag lateral
-                    z = alt
-                
-                # Mantener dentro del área
-                x = np.clip(x, 0, self.scenario['area_size_m'])
-                y = np.clip(y, 0, self.scenario['area_size_m'])
-                z = np.clip(z, 20, 300)
-                
-                positions.append([x, y, z])
+            # Mantener dentro del área
+            positions = np.column_stack([
+                np.clip(x, 0, self.scenario['area_size_m']),
+                np.clip(y, 0, self.scenario['area_size_m']),
+                np.clip(z, 20, 300)
+            ])
             
             trajectories[uav_id] = {
-                'positions': np.array(positions),
+                'positions': positions,
                 'times': time_points,
                 'config': uav
             }
@@ -139,37 +301,35 @@ class UAVSpecificSimulation:
         
         ber_results = {}
         
+        snr_range_db = np.asarray(snr_range_db, dtype=float)
+        bandwidth_hz = self.scenario['bandwidth_mhz'] * 1e6
+        
         for config in mimo_configs:
             nt, nr = config['nt'], config['nr']
-            ber_values = []
             
-            for snr_db in snr_range_db:
-                snr_linear = 10 ** (snr_db / 10)
+            # BER calculation for MIMO with ML detection (simplified)
+            if nt == 1 and nr == 1:  # SISO
+                # QPSK BER: 0.5·erfc(sqrt(snr))
+                ber_scale, snr_factor = 0.5, 1.0
+            else:  # MIMO
+                # Approximate BER for MIMO with diversity gain
+                diversity_order = min(nt, nr)
+                snr_factor = diversity_order
                 
-                # BER calculation for MIMO with ML detection (simplified)
-                if nt == 1 and nr == 1:  # SISO
-                    # QPSK BER
-                    ber = 0.5 * erfc(np.sqrt(snr_linear))
-                else:  # MIMO
-                    # Approximate BER for MIMO with diversity gain
-                    diversity_order = min(nt, nr)
-                    effective_snr = snr_linear * diversity_order
-                    
-                    # Array gain
-                    array_gain = np.sqrt(nt * nr)
-                    effective_snr *= array_gain
-                    
-                    # Beamforming gain (if applicable)
-                    if nt >= 4:
-                        beamforming_gain = np.log2(nt)  # Log gain with more antennas
-                        effective_snr *= beamforming_gain
-                    
-                    # MIMO BER (simplified Rayleigh fading)
-                    ber = (0.5) ** diversity_order * erfc(np.sqrt(effective_snr / 2))
+                # Array gain
+                snr_factor *= math.sqrt(nt * nr)
                 
-                # Numerical stability
-                ber = max(ber, 1e-8)
-                ber_values.append(ber)
+                # Beamforming gain (if applicable)
+                if nt >= 4:
+                    snr_factor *= math.log2(nt)  # Log gain with more antennas
+                
+                # MIMO BER (simplified Rayleigh fading): 0.5^d·erfc(sqrt(snr_eff/2))
+                ber_scale, snr_factor = 0.5 ** diversity_order, snr_factor / 2
+            
+            # Numerical stability (clamp dentro del kernel)
+            ber, _ = _ber_throughput_kernel(snr_range_db, ber_scale, float(snr_factor),
+                                            bandwidth_hz, self.fast_erfc)
+            ber_values = ber.tolist()
             
             ber_results[config['name']] = {
                 'snr_db': snr_range_db.tolist(),
@@ -193,53 +353,55 @@ class UAVSpecificSimulation:
         
         gnb_pos = np.array(self.scenario['gnb_position'])
         
-        # Para cada timestep, calcular performance
+        # Para cada timestep, calcular performance (sample every 5 seconds)
         time_points = trajectories['UAV_A']['times']
+        sampled_times = np.ascontiguousarray(time_points[::5])
+        sampled_positions = {uav_id: traj_data['positions'][::5]
+                             for uav_id, traj_data in trajectories.items()}
+        
+        # CASO 1: ENLACES DIRECTOS UAV ↔ gNB (todos los instantes y UAVs a la vez)
+        # Layout columnar: una matriz (n_tiempos, n_uavs) por métrica
+        uav_ids = list(sampled_positions)
+        pos_arr = np.stack([sampled_positions[uav_id] for uav_id in uav_ids], axis=1)
+        distances = np.linalg.norm(pos_arr - gnb_pos, axis=-1)
+        
+        # Path loss (Free space + urban)
+        path_loss_db = self._pl_const + 20*np.log10(distances)
+        
+        # LoS probability based on height
+        los_prob = 1 / (1 + 9.61 * np.exp(-0.16 * (pos_arr[..., 2] - 1.5)))
+        
+        # Total received power
+        tx_power_dbm = 43  # gNB power
+        rx_power_dbm = tx_power_dbm - path_loss_db + self._mimo_gain_db + self._bf_gain_db
+        
+        # SNR
+        snr_db = rx_power_dbm - self._noise_dbm
+        
+        # Throughput (Shannon)
+        snr_linear = np.exp(_LN10_OVER_10 * snr_db)
+        throughput_bps = self.scenario['bandwidth_mhz']*1e6 * np.log2(1 + snr_linear)
+        
+        simulation_results['direct_links'] = {
+            'times_s': sampled_times,
+            'uav_ids': uav_ids,
+            'distance_m': distances,
+            'path_loss_db': path_loss_db,
+            'los_probability': los_prob,
+            'snr_db': snr_db,
+            'throughput_mbps': throughput_bps / 1e6
+        }
         
-        for t_idx, t in enumerate(time_points[::5]):  # Sample every 5 seconds
+        # Posiciones como listas Python: el caso relay opera sobre escalares (math.*)
+        sampled_positions_list = {uav_id: positions.tolist()
+                                  for uav_id, positions in sampled_positions.items()}
+        gnb_xyz = gnb_pos.tolist()
+        
+        for t_idx, t in enumerate(sampled_times.tolist()):
             
             # Get UAV positions at this time
-            uav_positions = {}
-            for uav_id, traj_data in trajectories.items():
-                uav_positions[uav_id] = traj_data['positions'][t_idx * 5]
-            
-            # CASO 1: ENLACES DIRECTOS UAV ↔ gNB
-            direct_results = {}
-            for uav_id, pos in uav_positions.items():
-                distance = np.linalg.norm(pos - gnb_pos)
-                
-                # Path loss (Free space + urban)
-                path_loss_db = 32.45 + 20*np.log10(self.scenario['frequency_ghz']) + 20*np.log10(distance/1000)
-                
-                # LoS probability based on height
-                height = pos[2]
-                los_prob = 1 / (1 + 9.61 * np.exp(-0.16 * (height - 1.5)))
-                
-                # MIMO gain
-                mimo_gain_db = 10 * np.log10(self.mimo_config['gnb_antennas'] * self.mimo_config['uav_antennas'])
-                
-                # Beamforming gain
-                beamforming_gain_db = 7 if self.mimo_config['beamforming'] == 'SVD' else 0
-                
-                # Total received power
-                tx_power_dbm = 43  # gNB power
-                rx_power_dbm = tx_power_dbm - path_loss_db + mimo_gain_db + beamforming_gain_db
-                
-                # SNR
-                noise_power_dbm = -174 + 10*np.log10(self.scenario['bandwidth_mhz']*1e6)
-                snr_db = rx_power_dbm - noise_power_dbm
-                
-                # Throughput (Shannon)
-                snr_linear = 10**(snr_db/10)
-                throughput_bps = self.scenario['bandwidth_mhz']*1e6 * np.log2(1 + snr_linear)
-                
-                direct_results[uav_id] = {
-                    'distance_m': distance,
-                    'path_loss_db': path_loss_db,
-                    'los_probability': los_prob,
-                    'snr_db': snr_db,
-                    'throughput_mbps': throughput_bps / 1e6
-                }
+            uav_positions = {uav_id: positions[t_idx]
+                             for uav_id, positions in sampled_positions_list.items()}
             
             # CASO 2: ENLACES RELAY UAV ↔ UAV ↔ gNB
             relay_results = {}
@@ -250,21 +412,21 @@ class UAVSpecificSimulation:
                 relay_pos = uav_positions['UAV_B']
                 
                 # Link 1: gNB → Relay
-                dist_gnb_relay = np.linalg.norm(relay_pos - gnb_pos)
-                path_loss_1 = 32.45 + 20*np.log10(self.scenario['frequency_ghz']) + 20*np.log10(dist_gnb_relay/1000)
-                snr_1 = 43 - path_loss_1 + mimo_gain_db + beamforming_gain_db - noise_power_dbm
+                dist_gnb_relay = math.dist(relay_pos, gnb_xyz)
+                path_loss_1 = self._pl_const + 20*math.log10(dist_gnb_relay)
+                snr_1 = 43 - path_loss_1 + self._mimo_gain_db + self._bf_gain_db - self._noise_dbm
                 
                 # Link 2: Relay → User
-                dist_relay_user = np.linalg.norm(user_pos - relay_pos)
-                path_loss_2 = 32.45 + 20*np.log10(self.scenario['frequency_ghz']) + 20*np.log10(dist_relay_user/1000)
-                snr_2 = 30 - path_loss_2 + 6 - noise_power_dbm  # Lower relay power
+                dist_relay_user = math.dist(user_pos, relay_pos)
+                path_loss_2 = self._pl_const + 20*math.log10(dist_relay_user)
+                snr_2 = 30 - path_loss_2 + 6 - self._noise_dbm  # Lower relay power
                 
                 # End-to-end throughput (bottleneck)
-                snr_1_linear = 10**(snr_1/10)
-                snr_2_linear = 10**(snr_2/10)
+                snr_1_linear = math.exp(_LN10_OVER_10 * snr_1)
+                snr_2_linear = math.exp(_LN10_OVER_10 * snr_2)
                 
-                capacity_1 = self.scenario['bandwidth_mhz']*1e6 * np.log2(1 + snr_1_linear)
-                capacity_2 = self.scenario['bandwidth_mhz']*1e6 * np.log2(1 + snr_2_linear)
+                capacity_1 = self.scenario['bandwidth_mhz']*1e6 * math.log2(1 + snr_1_linear)
+                capacity_2 = self.scenario['bandwidth_mhz']*1e6 * math.log2(1 + snr_2_linear)
                 
                 relay_throughput = min(capacity_1, capacity_2) / 1e6  # Mbps
                 
@@ -276,10 +438,9 @@ class UAVSpecificSimulation:
                     'throughput_mbps': relay_throughput
                 }
             
-            simulation_results['direct_links'][f't_{t:.0f}s'] = direct_results
             simulation_results['relay_links'][f't_{t:.0f}s'] = relay_results
         
-        print(f"✅ Simulación temporal completada ({len(time_points[::5])} puntos)")
+        print(f"✅ Simulación temporal completada ({len(sampled_times)} puntos)")
         return simulation_results
     
     def analyze_height_impact(self, height_range=np.linspace(20, 300, 29)):
@@ -287,52 +448,50 @@ class UAVSpecificSimulation:
         
         print(f"\n📏 ANALIZANDO IMPACTO ALTURA...")
         
-        height_results = {}
         gnb_pos = np.array(self.scenario['gnb_position'])
+        heights = np.asarray(height_range, dtype=float)
         
         # Fixed horizontal distance
         horizontal_distance = 500  # meters
-        test_position_2d = gnb_pos[:2] + [horizontal_distance, 0]
-        
-        for height in height_range:
-            test_pos = np.array([test_position_2d[0], test_position_2d[1], height])
-            distance_3d = np.linalg.norm(test_pos - gnb_pos)
-            
-            # LoS probability (ITU-R model)
-            los_prob = 1 / (1 + 9.61 * np.exp(-0.16 * (height - 1.5)))
-            
-            # Path loss models
-            path_loss_los = 32.45 + 20*np.log10(self.scenario['frequency_ghz']) + 20*np.log10(distance_3d/1000)
-            path_loss_nlos = path_loss_los + 20  # Additional NLoS loss
-            
-            # Average path loss
-            avg_path_loss = los_prob * path_loss_los + (1 - los_prob) * path_loss_nlos
-            
-            # Performance calculation
-            mimo_gain_db = 10 * np.log10(self.mimo_config['gnb_antennas'])
-            beamforming_gain_db = 7
-            
-            rx_power = 43 - avg_path_loss + mimo_gain_db + beamforming_gain_db
-            noise_power = -174 + 10*np.log10(self.scenario['bandwidth_mhz']*1e6)
-            snr_db = rx_power - noise_power
-            
-            # BER (QPSK with MIMO diversity)
-            snr_linear = 10**(snr_db/10)
-            diversity_order = 4  # 4 UAV antennas
-            ber = (0.5)**diversity_order * erfc(np.sqrt(snr_linear * diversity_order))
-            
-            # Throughput
-            throughput = self.scenario['bandwidth_mhz']*1e6 * np.log2(1 + snr_linear) / 1e6
-            
-            height_results[f'{height:.0f}m'] = {
-                'height_m': height,
-                'distance_3d_m': distance_3d,
-                'los_probability': los_prob,
-                'path_loss_db': avg_path_loss,
-                'snr_db': snr_db,
-                'ber': max(ber, 1e-8),
-                'throughput_mbps': throughput
+        distance_3d = np.sqrt(horizontal_distance**2 + (heights - gnb_pos[2])**2)
+        
+        # LoS probability (ITU-R model)
+        los_prob = 1 / (1 + 9.61 * np.exp(-0.16 * (heights - 1.5)))
+        
+        # Path loss models
+        path_loss_los = self._pl_const + 20*np.log10(distance_3d)
+        path_loss_nlos = path_loss_los + 20  # Additional NLoS loss
+        
+        # Average path loss
+        avg_path_loss = los_prob * path_loss_los + (1 - los_prob) * path_loss_nlos
+        
+        # Performance calculation
+        mimo_gain_db = 10 * math.log10(self.mimo_config['gnb_antennas'])
+        beamforming_gain_db = 7
+        
+        rx_power = 43 - avg_path_loss + mimo_gain_db + beamforming_gain_db
+        snr_db = rx_power - self._noise_dbm
+        
+        # BER (QPSK with MIMO diversity) + Throughput en un solo kernel
+        diversity_order = 4  # 4 UAV antennas
+        ber, throughput = _ber_throughput_kernel(
+            snr_db, 0.5 ** diversity_order, float(diversity_order),
+            self.scenario['bandwidth_mhz'] * 1e6, self.fast_erfc)
+        
+        height_results = {
+            f'{h:.0f}m': {
+                'height_m': h,
+                'distance_3d_m': d,
+                'los_probability': p_los,
+                'path_loss_db': pl,
+                'snr_db': snr,
+                'ber': b,
+                'throughput_mbps': thr
             }
+            for h, d, p_los, pl, snr, b, thr in zip(
+                heights.tolist(), distance_3d.tolist(), los_prob.tolist(), avg_path_loss.tolist(),
+                snr_db.tolist(), ber.tolist(), throughput.tolist())
+        }
         
         print(f"✅ Análisis altura completado ({len(height_range)} alturas)")
         return height_results
@@ -348,59 +507,54 @@ class UAVSpecificSimulation:
             'comparison_metrics': {}
         }
         
-        # Test distances
+        # Test distances (todas evaluadas en un solo paso vectorizado)
         distances = np.linspace(100, 1000, 10)
         gnb_pos = np.array(self.scenario['gnb_position'])
         test_height = 100  # Fixed height
-        
-        for dist in distances:
-            # LoS scenario
-            test_pos_los = gnb_pos + [dist, 0, test_height - gnb_pos[2]]
-            distance_3d = np.linalg.norm(test_pos_los - gnb_pos)
-            
-            # LoS path loss
-            path_loss_los = 32.45 + 20*np.log10(self.scenario['frequency_ghz']) + 20*np.log10(distance_3d/1000)
-            
-            # NLoS path loss (add shadowing and excess loss)
-            path_loss_nlos = path_loss_los + 20 + 8 * np.random.randn()  # 8dB shadowing
-            
-            # Performance calculations for both
-            mimo_gain = 10 * np.log10(64)  # 64 antenna gNB
-            beamforming_gain = 7
-            tx_power = 43
-            noise_power = -174 + 10*np.log10(100e6)  # 100 MHz
-            
-            # LoS performance
-            rx_power_los = tx_power - path_loss_los + mimo_gain + beamforming_gain
-            snr_los = rx_power_los - noise_power
-            throughput_los = 100 * np.log2(1 + 10**(snr_los/10))
-            ber_los = 0.5 * erfc(np.sqrt(10**(snr_los/10)))
-            
-            # NLoS performance (with diversity gain)
-            rx_power_nlos = tx_power - path_loss_nlos + mimo_gain + beamforming_gain + 3  # Diversity gain
-            snr_nlos = rx_power_nlos - noise_power
-            throughput_nlos = 100 * np.log2(1 + 10**(snr_nlos/10))
-            ber_nlos = (0.5)**2 * erfc(np.sqrt(2 * 10**(snr_nlos/10)))  # Diversity order 2
-            
-            comparison_results['los_scenario'][f'{dist:.0f}m'] = {
-                'distance_m': dist,
-                'path_loss_db': path_loss_los,
-                'snr_db': snr_los,
-                'throughput_mbps': throughput_los,
-                'ber': max(ber_los, 1e-8)
-            }
-            
-            comparison_results['nlos_scenario'][f'{dist:.0f}m'] = {
-                'distance_m': dist,
-                'path_loss_db': path_loss_nlos,
-                'snr_db': snr_nlos,
-                'throughput_mbps': throughput_nlos,
-                'ber': max(ber_nlos, 1e-8)
+        distance_3d = np.sqrt(distances**2 + (test_height - gnb_pos[2])**2)
+        
+        # LoS path loss
+        path_loss_los = self._pl_const + 20*np.log10(distance_3d)
+        
+        # NLoS path loss (add shadowing and excess loss)
+        shadowing = 8 * self._rng.standard_normal(len(distances))  # 8dB shadowing
+        path_loss_nlos = path_loss_los + 20 + shadowing
+        
+        # Performance calculations for both
+        mimo_gain = 10 * math.log10(64)  # 64 antenna gNB
+        beamforming_gain = 7
+        tx_power = 43
+        bandwidth_hz = self.scenario['bandwidth_mhz'] * 1e6
+        
+        # LoS performance: QPSK 0.5·erfc(sqrt(snr))
+        snr_los = tx_power - path_loss_los + mimo_gain + beamforming_gain - self._noise_dbm
+        ber_los, throughput_los = _ber_throughput_kernel(
+            snr_los, 0.5, 1.0, bandwidth_hz, self.fast_erfc)
+        
+        # NLoS performance (with diversity gain): diversity order 2
+        snr_nlos = tx_power - path_loss_nlos + mimo_gain + beamforming_gain + 3 - self._noise_dbm
+        ber_nlos, throughput_nlos = _ber_throughput_kernel(
+            snr_nlos, 0.5 ** 2, 2.0, bandwidth_hz, self.fast_erfc)
+        
+        for scenario, path_loss, snr, thr, ber in (
+                ('los_scenario', path_loss_los, snr_los, throughput_los, ber_los),
+                ('nlos_scenario', path_loss_nlos, snr_nlos, throughput_nlos, ber_nlos)):
+            comparison_results[scenario] = {
+                f'{d:.0f}m': {
+                    'distance_m': d,
+                    'path_loss_db': pl,
+                    'snr_db': snr_val,
+                    'throughput_mbps': thr_val,
+                    'ber': ber_val
+                }
+                for d, pl, snr_val, thr_val, ber_val in zip(
+                    distances.tolist(), path_loss.tolist(), snr.tolist(),
+                    thr.tolist(), ber.tolist())
             }
         
         # Calculate average gains
-        los_avg_throughput = np.mean([v['throughput_mbps'] for v in comparison_results['los_scenario'].values()])
-        nlos_avg_throughput = np.mean([v['throughput_mbps'] for v in comparison_results['nlos_scenario'].values()])
+        los_avg_throughput = np.mean(throughput_los)
+        nlos_avg_throughput = np.mean(throughput_nlos)
         
         comparison_results['comparison_metrics'] = {
             'los_avg_throughput_mbps': los_avg_throughput,
@@ -412,18 +566,22 @@ class UAVSpecificSimulation:
         print(f"✅ Comparación LoS vs NLoS completada")
         return comparison_results
     
-    def generate_results_plots(self, ber_results, height_results, los_nlos_results, trajectories):
-        """Generar plots de todos los resultados"""
+    def _build_results_figure(self, ber_results, trajectories):
+        """Crear figura y artistas una sola vez (las llamadas siguientes sólo actualizan datos)"""
         
-        print(f"\n📊 GENERANDO PLOTS DE RESULTADOS...")
+        plt = _pyplot()
+        from matplotlib.lines import Line2D
+        from mpl_toolkits.mplot3d.art3d import Line3DCollection
         
         fig = plt.figure(figsize=(20, 16))
+        artists = {}
         
         # 1. BER vs SNR
         ax1 = fig.add_subplot(2, 3, 1)
-        for config_name, data in ber_results.items():
-            ax1.semilogy(data['snr_db'], data['ber'], 'o-', linewidth=2, label=config_name)
-        
+        artists['ber'] = {
+            config_name: ax1.semilogy([], [], 'o-', linewidth=2, label=config_name)[0]
+            for config_name in ber_results
+        }
         ax1.set_xlabel('SNR (dB)')
         ax1.set_ylabel('BER')
         ax1.set_title('BER vs SNR - Configuraciones MIMO')
@@ -433,9 +591,7 @@ class UAVSpecificSimulation:
         
         # 2. Impacto altura - Throughput
         ax2 = fig.add_subplot(2, 3, 2)
-        heights = [float(k.replace('m','')) for k in height_results.keys()]
-        throughputs = [v['throughput_mbps'] for v in height_results.values()]
-        ax2.plot(heights, throughputs, 'g-o', linewidth=3, markersize=6)
+        artists['height_throughput'] = ax2.plot([], [], 'g-o', linewidth=3, markersize=6)[0]
         ax2.set_xlabel('Altura UAV (m)')
         ax2.set_ylabel('Throughput (Mbps)')
         ax2.set_title('Impacto Altura en Performance')
@@ -443,8 +599,7 @@ class UAVSpecificSimulation:
         
         # 3. Impacto altura - BER
         ax3 = fig.add_subplot(2, 3, 3)
-        bers = [v['ber'] for v in height_results.values()]
-        ax3.semilogy(heights, bers, 'r-s', linewidth=3, markersize=6)
+        artists['height_ber'] = ax3.semilogy([], [], 'r-s', linewidth=3, markersize=6)[0]
         ax3.set_xlabel('Altura UAV (m)')
         ax3.set_ylabel('BER')
         ax3.set_title('BER vs Altura UAV')
@@ -452,23 +607,19 @@ class UAVSpecificSimulation:
         
         # 4. LoS vs NLoS Comparison
         ax4 = fig.add_subplot(2, 3, 4)
-        distances = [v['distance_m'] for v in los_nlos_results['los_scenario'].values()]
-        throughput_los = [v['throughput_mbps'] for v in los_nlos_results['los_scenario'].values()]
-        throughput_nlos = [v['throughput_mbps'] for v in los_nlos_results['nlos_scenario'].values()]
-        
-        ax4.plot(distances, throughput_los, 'b-o', linewidth=2, label='LoS')
-        ax4.plot(distances, throughput_nlos, 'r-s', linewidth=2, label='NLoS')
+        artists['los'] = ax4.plot([], [], 'b-o', linewidth=2, label='LoS')[0]
+        artists['nlos'] = ax4.plot([], [], 'r-s', linewidth=2, label='NLoS')[0]
         ax4.set_xlabel('Distancia (m)')
         ax4.set_ylabel('Throughput (Mbps)')
         ax4.set_title('Comparación LoS vs NLoS')
         ax4.legend()
         ax4.grid(True, alpha=0.3)
         
-        # 5. Ganancia Beamforming
+        # 5. Ganancia Beamforming (datos fijos: se dibuja una sola vez)
         ax5 = fig.add_subplot(2, 3, 5)
         beamforming_gains = [0, 2, 4, 6, 7, 8]  # dB
         beamforming_labels = ['Omni', 'Fixed', 'MRT', 'ZF', 'SVD', 'Adaptive']
-        throughput_gains = [100 * (10**(g/10) - 1) for g in beamforming_gains]
+        throughput_gains = [100 * (math.exp(_LN10_OVER_10 * g) - 1) for g in beamforming_gains]
         
         bars = ax5.bar(beamforming_labels, throughput_gains, color='purple', alpha=0.7)
         ax5.set_ylabel('Ganancia Throughput (%)')
@@ -487,31 +638,105 @@ class UAVSpecificSimulation:
         
         # Plot gNB
         gnb_pos = self.scenario['gnb_position']
-        ax6.scatter(*gnb_pos, c='red', s=200, marker='^', label='gNB')
-        
-        # Plot trajectories
-        colors = ['blue', 'green', 'orange', 'purple']
-        for i, (uav_id, traj_data) in enumerate(trajectories.items()):
-            positions = traj_data['positions']
-            ax6.plot(positions[:,0], positions[:,1], positions[:,2], 
-                    color=colors[i], linewidth=2, label=f'{uav_id}')
-            
-            # Mark start and end
-            ax6.scatter(*positions[0], c=colors[i], s=100, marker='o')
-            ax6.scatter(*positions[-1], c=colors[i], s=100, marker='s')
+        gnb_marker = ax6.scatter(*gnb_pos, c='red', s=200, marker='^', label='gNB')
+        
+        # Todas las trayectorias en una sola colección (un artista para N UAVs)
+        colors = ['blue', 'green', 'orange', 'purple'][:len(trajectories)]
+        trajectory_lines = Line3DCollection([t['positions'] for t in trajectories.values()],
+                                            colors=colors, linewidths=2)
+        ax6.add_collection3d(trajectory_lines)
+        artists['trajectories'] = trajectory_lines
+        artists['trajectory_colors'] = colors
+        artists['trajectory_markers'] = ()
         
         ax6.set_xlabel('X (m)')
         ax6.set_ylabel('Y (m)')
         ax6.set_zlabel('Altura (m)')
         ax6.set_title('Trayectorias 3D UAVs')
-        ax6.legend()
         
-        plt.tight_layout()
+        # La colección no genera entradas de leyenda por UAV
+        legend_handles = [gnb_marker] + [
+            Line2D([], [], color=color, linewidth=2, label=f'{uav_id}')
+            for uav_id, color in zip(trajectories, colors)
+        ]
+        ax6.legend(handles=legend_handles)
+        
+        self._fig = fig
+        self._axes = (ax1, ax2, ax3, ax4, ax5, ax6)
+        self._plot_artists = artists
+        self._plot_keys = (tuple(ber_results), tuple(trajectories))
+    
+    def generate_results_plots(self, ber_results, height_results, los_nlos_results, trajectories,
+                               final=True):
+        """
+        Generar plots de todos los resultados
+        
+        Args:
+            final: Guardar a 300 dpi con bbox ajustado; False usa 150 dpi para
+                barridos intermedios
+        """
+        
+        print(f"\n📊 GENERANDO PLOTS DE RESULTADOS...")
+        
+        # Reutilizar figura/artistas entre llamadas; sólo se reconstruye si cambian
+        # las configuraciones MIMO o los UAVs
+        if self._fig is None or self._plot_keys != (tuple(ber_results), tuple(trajectories)):
+            if self._fig is not None:
+                _pyplot().close(self._fig)
+            self._build_results_figure(ber_results, trajectories)
+        
+        artists = self._plot_artists
+        ax1, ax2, ax3, ax4, ax5, ax6 = self._axes
+        
+        # 1. BER vs SNR
+        for config_name, data in ber_results.items():
+            artists['ber'][config_name].set_data(data['snr_db'], data['ber'])
+        
+        # 2-3. Impacto altura
+        heights = [float(k.replace('m','')) for k in height_results.keys()]
+        throughputs = [v['throughput_mbps'] for v in height_results.values()]
+        bers = [v['ber'] for v in height_results.values()]
+        artists['height_throughput'].set_data(heights, throughputs)
+        artists['height_ber'].set_data(heights, bers)
+        
+        # 4. LoS vs NLoS
+        distances = [v['distance_m'] for v in los_nlos_results['los_scenario'].values()]
+        throughput_los = [v['throughput_mbps'] for v in los_nlos_results['los_scenario'].values()]
+        throughput_nlos = [v['throughput_mbps'] for v in los_nlos_results['nlos_scenario'].values()]
+        artists['los'].set_data(distances, throughput_los)
+        artists['nlos'].set_data(distances, throughput_nlos)
+        
+        for ax in (ax1, ax2, ax3, ax4):
+            ax.relim()
+            ax.autoscale_view()
+        
+        # 6. 3D Trajectories
+        segments = [traj_data['positions'] for traj_data in trajectories.values()]
+        artists['trajectories'].set_segments(segments)
+        
+        # Marcas inicio/fin: un scatter para todos los inicios y otro para los finales
+        for marker in artists['trajectory_markers']:
+            marker.remove()
+        starts = np.array([positions[0] for positions in segments])
+        ends = np.array([positions[-1] for positions in segments])
+        colors = artists['trajectory_colors']
+        artists['trajectory_markers'] = (
+            ax6.scatter(starts[:,0], starts[:,1], starts[:,2], c=colors, s=100, marker='o'),
+            ax6.scatter(ends[:,0], ends[:,1], ends[:,2], c=colors, s=100, marker='s')
+        )
+        
+        all_positions = np.vstack([self.scenario['gnb_position']] + segments)
+        ax6.auto_scale_xyz(all_positions[:,0], all_positions[:,1], all_positions[:,2],
+                           had_data=False)
+        
+        self._fig.tight_layout()
         
         # Save plot
         plot_path = f"{self.output_dir}/complete_simulation_results.png"
-        plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        if final:
+            self._fig.savefig(plot_path, dpi=300, bbox_inches='tight')
+        else:
+            self._fig.savefig(plot_path, dpi=150)
         
         print(f"✅ Plot principal guardado: {plot_path}")
         return plot_path
@@ -534,16 +759,21 @@ class UAVSpecificSimulation:
             'height_impact': height_results,
             'los_vs_nlos': los_nlos_results,
             'direct_vs_relay': simulation_results,
-            'trajectories': {k: {'positions': v['positions'].tolist(), 
-                               'times': v['times'].tolist(),
+            'trajectories': {k: {'positions': v['positions'], 
+                               'times': v['times'],
                                'config': v['config']} 
                            for k, v in trajectories.items()}
         }
         
-        # Save JSON
+        # Save JSON (orjson serializa arrays numpy directamente)
         json_path = f"{self.output_dir}/complete_simulation_data.json"
-        with open(json_path, 'w') as f:
-            json.dump(complete_results, f, indent=2)
+        if ORJSON_AVAILABLE:
+            with open(json_path, 'wb') as f:
+                f.write(orjson.dumps(complete_results, option=orjson.OPT_SERIALIZE_NUMPY |
+                                     orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(json_path, 'w') as f:
+                json.dump(complete_results, f, indent=2, cls=_NpEncoder)
         
         # Save summary report
         report_path = f"{self.output_dir}/simulation_summary_report.md"
@@ -563,72 +793,69 @@ class UAVSpecificSimulation:
     def generate_summary_report(self, results, report_path):
         """Generar reporte resumen"""
         
-        report_content = f"""
-# 🎯 SIMULACIÓN UAV 5G NR - REPORTE OBJETIVO ESPECÍFICO
-
-## Configuración Simulación
-- **MIMO Masivo gNB**: {results['simulation_info']['mimo_config']['gnb_antennas']} antenas
-- **UAVs configurados**: {len(results['simulation_info']['uav_configs'])}
-- **Área simulación**: {results['simulation_info']['scenario']['area_size_m']}m x {results['simulation_info']['scenario']['area_size_m']}m
-- **Frecuencia**: {results['simulation_info']['scenario']['frequency_ghz']} GHz
-
-## 📊 Resultados Principales
-
-### BER vs SNR
-- **Mejor configuración**: MIMO Masivo 64x4 (BER < 1e-6 @ SNR 20dB)
-- **Ganancia MIMO**: Factor 10⁴ mejora BER vs SISO
-- **Beamforming crítico**: SVD beamforming esencial para performance
-
-### Impacto Altura UAV
-- **Altura óptima**: ~100m (compromiso LoS/NLoS)
-- **Rango operacional**: 50-200m efectivo
-- **BER mínimo**: {min([v['ber'] for v in results['height_impact'].values()]):.2e}
-
-### Comparación LoS vs NLoS
-- **Resultado**: {results['los_vs_nlos']['comparison_metrics']['interpretation']}
-- **Factor ventaja**: {results['los_vs_nlos']['comparison_metrics'].get('nlos_advantage_factor', 'N/A'):.2f}x
-
-### Casos Estudio
-- **Directo UAV↔gNB**: Implementado ✅
-- **Relay UAV↔UAV↔gNB**: Implementado ✅
-- **Trayectorias 3D**: 4 patrones diferentes ✅
-
-## 🎯 Conclusiones Específicas
-1. **MIMO masivo fundamental** para BER objetivo
-2. **Altura 100m óptima** balance performance/regulación
-3. **Beamforming SVD** aporta 7dB ganancia crítica
-4. **NLoS puede superar LoS** con MIMO adecuado
-5. **Relay efectivo** para extensión cobertura
-
-*Simulación completada: {results['simulation_info']['timestamp']}*
-"""
+        info = results['simulation_info']
+        metrics = results['los_vs_nlos']['comparison_metrics']
+        
+        # Agregados precalculados (generador, sin lista intermedia)
+        min_ber = min(v['ber'] for v in results['height_impact'].values())
+        
+        report_content = _REPORT_TEMPLATE.format(
+            gnb_antennas=info['mimo_config']['gnb_antennas'],
+            num_uavs=len(info['uav_configs']),
+            area_size_m=info['scenario']['area_size_m'],
+            frequency_ghz=info['scenario']['frequency_ghz'],
+            min_ber=min_ber,
+            interpretation=metrics['interpretation'],
+            advantage_factor=metrics.get('nlos_advantage_factor', 'N/A'),
+            timestamp=info['timestamp']
+        )
         
-        with open(report_path, 'w', encoding='utf-8') as f:
+        with open(report_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
             f.write(report_content)
     
-    def run_complete_specific_simulation(self):
-        """Ejecutar simulación completa específica para objetivo original"""
+    def run_complete_specific_simulation(self, skip_plots=None, max_workers=4):
+        """
+        Ejecutar simulación completa específica para objetivo original
+        
+        Args:
+            skip_plots: Omitir plots (sólo JSON/reporte). Por defecto se activa
+                con la variable de entorno UAV_SKIP_PLOTS=1
+            max_workers: Hilos para los análisis independientes (pasos 2-5),
+                1 = ejecución secuencial
+        """
+        
+        if skip_plots is None:
+            skip_plots = os.environ.get('UAV_SKIP_PLOTS') == '1'
         
         print("\n🚀 EJECUTANDO SIMULACIÓN COMPLETA ESPECÍFICA...")
         
         # 1. Generate trajectories
         trajectories = self.generate_3d_trajectories()
         
-        # 2. Calculate BER vs SNR
-        ber_results = self.calculate_ber_vs_snr()
-        
-        # 3. Simulate direct vs relay cases  
-        simulation_results = self.simulate_direct_vs_relay_cases(trajectories)
-        
-        # 4. Analyze height impact
-        height_results = self.analyze_height_impact()
-        
-        # 5. Compare LoS vs NLoS
-        los_nlos_results = self.compare_los_vs_nlos()
+        # 2-5. Análisis independientes entre sí: BER vs SNR, directo vs relay,
+        # impacto altura y LoS vs NLoS (NumPy libera el GIL en los cálculos)
+        if max_workers <= 1:
+            ber_results = self.calculate_ber_vs_snr()
+            simulation_results = self.simulate_direct_vs_relay_cases(trajectories)
+            height_results = self.analyze_height_impact()
+            los_nlos_results = self.compare_los_vs_nlos()
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                ber_future = pool.submit(self.calculate_ber_vs_snr)
+                relay_future = pool.submit(self.simulate_direct_vs_relay_cases, trajectories)
+                height_future = pool.submit(self.analyze_height_impact)
+                los_nlos_future = pool.submit(self.compare_los_vs_nlos)
+                
+                ber_results = ber_future.result()
+                simulation_results = relay_future.result()
+                height_results = height_future.result()
+                los_nlos_results = los_nlos_future.result()
         
-        # 6. Generate plots
-        plot_path = self.generate_results_plots(ber_results, height_results, 
-                                              los_nlos_results, trajectories)
+        # 6. Generate plots (matplotlib no se importa si se omiten)
+        plot_path = None
+        if not skip_plots:
+            plot_path = self.generate_results_plots(ber_results, height_results, 
+                                                  los_nlos_results, trajectories)
         
         # 7. Save all results
         saved_files = self.save_all_results(ber_results, height_results, 
@@ -636,7 +863,8 @@ class UAVSpecificSimulation:
         
         print(f"\n✅ SIMULACIÓN ESPECÍFICA COMPLETADA!")
         print(f"📁 Resultados: {self.output_dir}")
-        print(f"🎨 Plot principal: {plot_path}")
+        if plot_path:
+            print(f"🎨 Plot principal: {plot_path}")
         
         return {
             'ber_results': ber_results,
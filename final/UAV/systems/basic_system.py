@@ -2,23 +2,122 @@
 Basic UAV System using Sionna SYS
 Sistema básico gNB → UAV usando abstracciones de Sionna SYS
 """
+import math
+from typing import NamedTuple
 import numpy as np
 import tensorflow as tf
 import sionna
-from sionna.sys.utils import *
-try:
-    from sionna.sys import *
-except ImportError:
-    print("⚠️  sionna.sys no disponible, usando RT directo")
-    pass
 
 # Importar configuraciones y escenario
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config.system_config import *
+from config.system_config import AntennaConfig, RFConfig, ScenarioConfig, SimulationConfig
 from scenarios.munich_uav_scenario import MunichUAVScenario
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# log10(x) = ln(x)/ln(10): recíproco precalculado (float32, dtype del kernel TF)
+_INV_LN10 = np.float32(1.0 / np.log(10.0))
+_LN2 = math.log(2.0)
+
+# Reducciones del canal en GPU si hay una disponible (evita fallback implícito a CPU)
+_TF_DEVICE = '/GPU:0' if tf.config.list_physical_devices('GPU') else '/CPU:0'
+
+def _mean_power_bf16(h, axis=None):
+    """
+    mean(|h|^2) con |h|^2 en bfloat16 y acumulación en float32
+    bf16 conserva el rango de exponente de float32 (los |h|^2 sin boost rondan 1e-10
+    y en float16 darían underflow); la media se acumula en float32 para no perder precisión
+    """
+    re = tf.cast(tf.math.real(h), tf.bfloat16)
+    im = tf.cast(tf.math.imag(h), tf.bfloat16)
+    return tf.reduce_mean(tf.cast(re * re + im * im, tf.float32), axis=axis)
+
+@tf.function(jit_compile=True, input_signature=[
+    tf.TensorSpec(None, tf.complex64),   # h_freq: respuesta en frecuencia del canal
+    tf.TensorSpec([], tf.float32)        # power_boost_lin
+])
+def _channel_gain_kernel(h_freq, power_boost_lin):
+    """Ganancia del canal (dB) con power boost: independiente del SNR"""
+    # Calculate channel gain (instead of path loss)
+    # Apply power boost similar to the PHY solution for realistic values
+    # Channel power with boost: |h|^2 = re^2 + im^2 (sin sqrt de tf.abs) y el boost
+    # como escalar tras la reducción (sin tensor h_freq_boosted intermedio)
+    channel_power = power_boost_lin * _mean_power_bf16(h_freq)
+    return 10.0 * _INV_LN10 * tf.math.log(channel_power + 1e-12)
+
+@tf.function(jit_compile=True, input_signature=[
+    tf.TensorSpec(None, tf.complex64),   # h_freq: [num_rx, ...] respuesta en frecuencia del canal
+    tf.TensorSpec([None], tf.int32),     # rx_idx: receptores a evaluar
+    tf.TensorSpec([], tf.float32)        # power_boost_lin
+])
+def _channel_gain_batch_kernel(h_freq, rx_idx, power_boost_lin):
+    """Ganancia del canal (dB) por receptor: misma reducción que _channel_gain_kernel, eje rx conservado"""
+    # Reducir primero y seleccionar después: el gather actúa sobre [num_rx] y no copia el canal
+    h = tf.reshape(h_freq, [tf.shape(h_freq)[0], -1])
+    channel_power = power_boost_lin * tf.gather(_mean_power_bf16(h, axis=1), rx_idx)
+    return 10.0 * _INV_LN10 * tf.math.log(channel_power + 1e-12)
+
+def _sweep_loop(snr_db, gain_lin, mimo_gain, bandwidth_mhz):
+    """
+    Barrido SNR/altura: métricas por punto dado SNR (dB) y ganancia lineal del canal
+    Returns: (throughput_mbps, bler, se)
+    """
+    n = snr_db.shape[0]
+    throughput_mbps = np.empty(n)
+    bler = np.empty(n)
+    se = np.empty(n)
+    for i in range(n):
+        # Effective SNR calculation
+        effective_snr = 10.0 ** (snr_db[i] / 10.0) * gain_lin[i]
+        # Spectral efficiency (bits/s/Hz) with MIMO
+        se[i] = mimo_gain * math.log1p(effective_snr) / _LN2
+        throughput_mbps[i] = se[i] * bandwidth_mhz
+        # Simple BLER model (exponential decay with effective SNR)
+        bler[i] = math.exp(-effective_snr / 10.0)
+    return throughput_mbps, bler, se
+
+if NUMBA_AVAILABLE:
+    _sweep = njit(cache=True, fastmath=True)(_sweep_loop)
+else:
+    def _sweep(snr_db, gain_lin, mimo_gain, bandwidth_mhz):
+        """Versión NumPy del barrido (sin numba)"""
+        effective_snr = 10.0 ** (snr_db / 10.0) * gain_lin
+        se = mimo_gain * np.log1p(effective_snr) / _LN2
+        return se * bandwidth_mhz, np.exp(-effective_snr / 10.0), se
+
+class SNRMetrics(NamedTuple):
+    """
+    Métricas de un punto SNR (acceso por atributo)
+    Mantiene el acceso tipo dict (metrics['throughput_mbps']) de los consumidores existentes
+    """
+    throughput_mbps: float
+    spectral_efficiency: float
+    bler: float
+    channel_gain_db: float
+    effective_snr_db: float
+    channel_condition: dict
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+    
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self._fields else default
+    
+    def keys(self):
+        return self._fields
+
 class BasicUAVSystem:
     """
     Sistema básico UAV usando Sionna SYS
@@ -31,6 +130,18 @@ class BasicUAVSystem:
         
         print("🔧 Inicializando sistema UAV...")
         
+        # Constantes de configuración: fuera de los caminos calientes
+        # Shannon capacity with MIMO gain (rough approximation)
+        self._mimo_gain = float(min(AntennaConfig.GNB_ARRAY['num_rows'] * AntennaConfig.GNB_ARRAY['num_cols'],
+                                    AntennaConfig.UAV_ARRAY['num_rows'] * AntennaConfig.UAV_ARRAY['num_cols']))
+        self._bw_mhz = RFConfig.BANDWIDTH / 1e6
+        # Tensor creado una vez: las llamadas a los kernels no convierten el float en cada invocación
+        # (el resto de constantes del kernel quedan embebidas en el grafo al trazar)
+        self._power_boost_lin = tf.constant(10.0 ** (50.0 / 10.0), tf.float32)  # Same boost we used in PHY analysis
+        
+        # Canal por objeto paths: id(paths) -> (paths, (channel_gain_db, conditions))
+        self._chan_cache = {}
+        
         # Get paths for channel
         self.paths = self.scenario.get_paths(max_depth=5)
         
@@ -62,145 +173,166 @@ class BasicUAVSystem:
         
         print("✅ Sistema configurado")
     
-    def simulate_throughput(self, snr_db_range=None):
+    def simulate_throughput(self, snr_db_range=None, verbose=False):
         """
         Simular throughput vs SNR
+        verbose: imprimir un resumen por punto al final del barrido
         Returns: dict con métricas del sistema
         """
         if snr_db_range is None:
             snr_db_range = np.arange(0, 31, 5)  # 0 to 30 dB
         
-        print(f"🎯 Simulando throughput para SNR: {snr_db_range[0]} a {snr_db_range[-1]} dB")
+        # Canal, condiciones y ganancia MIMO no dependen del SNR: una sola vez
+        channel_gain_db, conditions = self._precompute_channel()
+        
+        # Todo el barrido SNR en una sola llamada al kernel compilado
+        snr_db = np.asarray(snr_db_range, dtype=np.float64)
+        throughput_mbps, bler, se = _sweep(
+            snr_db, np.full(snr_db.shape, 10.0 ** (channel_gain_db / 10.0)),
+            self._mimo_gain, self._bw_mhz)
         
         results = {
             'snr_db': snr_db_range,
-            'throughput_mbps': [],
-            'bler': [],
-            'spectral_efficiency': [],
-            'channel_conditions': []
+            'throughput_mbps': throughput_mbps,
+            'bler': bler,
+            'spectral_efficiency': se,
+            'channel_conditions': [conditions] * len(snr_db_range)
         }
         
-        for snr_db in snr_db_range:
-            print(f"  SNR = {snr_db} dB...", end="")
-            
-            # Simulate for this SNR point
-            metrics = self._simulate_single_snr(snr_db)
-            
-            results['throughput_mbps'].append(metrics['throughput_mbps'])
-            results['bler'].append(metrics['bler'])
-            results['spectral_efficiency'].append(metrics['spectral_efficiency'])
-            results['channel_conditions'].append(metrics['channel_condition'])
-            
-            print(f" Throughput={metrics['throughput_mbps']:.1f} Mbps")
-        
-        # Convert to numpy arrays
-        for key in ['throughput_mbps', 'bler', 'spectral_efficiency']:
-            results[key] = np.array(results[key])
+        if verbose:
+            # Resumen en una sola escritura a stdout
+            lines = [f"🎯 Simulando throughput para SNR: {snr_db_range[0]} a {snr_db_range[-1]} dB"]
+            lines.extend(f"  SNR = {snr} dB... Throughput={tp:.1f} Mbps"
+                         for snr, tp in zip(snr_db_range, results['throughput_mbps']))
+            lines.append("✅ Simulación completada")
+            sys.stdout.write("\n".join(lines) + "\n")
         
-        print(f"✅ Simulación completada")
         return results
     
-    def _simulate_single_snr(self, snr_db):
-        """Simular un punto SNR"""
+    def _simulate_single_snr(self, snr_db, paths=None):
+        """Simular un punto SNR (paths: por defecto self.paths)"""
+        return self._snr_point(snr_db, *self._precompute_channel(paths))
+    
+    def _precompute_channel(self, paths=None):
+        """
+        Métricas del canal independientes del SNR (una vez por conjunto de paths)
+        Returns: (channel_gain_db, conditions)
+        """
+        return self._cached_channel(self.paths if paths is None else paths)
+    
+    def _cached_channel(self, paths):
+        """
+        Respuesta y condiciones del canal memorizadas por identidad de paths
+        Returns: (channel_gain_db, conditions)
+        """
+        entry = self._chan_cache.get(id(paths))
+        if entry is not None and entry[0] is paths:
+            return entry[1]
         
         # Get channel response
-        h_freq, frequencies = self.scenario.get_channel_response(self.paths)
+        h_freq, frequencies = self.scenario.get_channel_response(paths)
         
         # Analyze channel conditions
-        conditions = self.scenario.analyze_channel_conditions(self.paths)
+        conditions = self.scenario.analyze_channel_conditions(paths)
         
-        # Calculate channel gain (instead of path loss)
-        # Apply power boost similar to the PHY solution for realistic values
-        power_boost_db = 50.0  # Same boost we used in PHY analysis
-        h_freq_boosted = h_freq * tf.cast(tf.sqrt(10.0 ** (power_boost_db / 10.0)), tf.complex64)
+        with tf.device(_TF_DEVICE):
+            channel_gain_db = _channel_gain_kernel(h_freq, self._power_boost_lin)
+        value = (float(channel_gain_db), conditions)
         
-        # Channel power with boost
-        channel_power = tf.reduce_mean(tf.abs(h_freq_boosted) ** 2)
-        channel_gain_db = 10 * tf.math.log(channel_power + 1e-12) / tf.math.log(10.0)
+        # Sólo se conserva el paths vigente (los barridos generan uno nuevo por posición)
+        self._chan_cache.clear()
+        self._chan_cache[id(paths)] = (paths, value)
+        return value
+    
+    def _snr_point(self, snr_db, channel_gain_db, conditions):
+        """Métricas de un punto SNR a partir del canal precalculado"""
         
+        # Aritmética escalar en Python (math): sin construcción de tensores ni syncs TF
         # Effective SNR calculation
-        snr_linear = 10 ** (snr_db / 10.0)
-        channel_gain_linear = 10 ** (float(channel_gain_db) / 10.0)
-        effective_snr = snr_linear * channel_gain_linear
-        
-        # Shannon capacity with MIMO gain (rough approximation)
-        mimo_gain = min(AntennaConfig.GNB_ARRAY['num_rows'] * AntennaConfig.GNB_ARRAY['num_cols'],
-                       AntennaConfig.UAV_ARRAY['num_rows'] * AntennaConfig.UAV_ARRAY['num_cols'])
+        snr_linear = 10.0 ** (snr_db / 10.0)
+        effective_snr = snr_linear * 10.0 ** (channel_gain_db / 10.0)
         
         # Spectral efficiency (bits/s/Hz) with MIMO
-        se = float(mimo_gain * tf.math.log(1.0 + effective_snr) / tf.math.log(2.0))
-        
-        # Throughput (assuming 100 MHz bandwidth)
-        throughput_mbps = se * RFConfig.BANDWIDTH / 1e6
+        se = self._mimo_gain * math.log1p(effective_snr) / _LN2
         
         # Simple BLER model (exponential decay with effective SNR)
-        bler = float(tf.exp(-effective_snr / 10.0))  # More realistic threshold
+        bler = math.exp(-effective_snr / 10.0)
         
-        return {
-            'throughput_mbps': throughput_mbps,
-            'spectral_efficiency': se,
-            'bler': bler,
-            'channel_gain_db': float(channel_gain_db),
-            'effective_snr_db': 10 * np.log10(effective_snr + 1e-12),
-            'channel_condition': conditions
-        }
+        # Throughput (assuming 100 MHz bandwidth)
+        throughput_mbps = se * self._bw_mhz
+        
+        return SNRMetrics(
+            throughput_mbps=throughput_mbps,
+            spectral_efficiency=se,
+            bler=bler,
+            channel_gain_db=channel_gain_db,
+            effective_snr_db=10 * math.log10(effective_snr + 1e-12),
+            channel_condition=conditions
+        )
     
-    def simulate_height_analysis(self, height_range=None):
+    def simulate_height_analysis(self, height_range=None, verbose=False):
         """
         Simular throughput vs altura UAV
+        verbose: imprimir un resumen por altura al final del barrido
         Returns: dict con métricas vs altura
         """
         if height_range is None:
             height_range = ScenarioConfig.HEIGHT_RANGE
         
-        print(f"📈 Análisis de altura: {min(height_range)} a {max(height_range)} m")
-        
+        # Buffers preasignados: se rellenan desde el ray tracing por lotes
+        # (throughput y SE salen del kernel de barrido al final)
+        n = len(height_range)
         results = {
             'heights': height_range,
-            'throughput_mbps': [],
-            'path_loss_db': [],
-            'los_probability': [],
-            'spectral_efficiency': []
+            'throughput_mbps': None,
+            'path_loss_db': np.empty(n),
+            'los_probability': np.empty(n),
+            'spectral_efficiency': None
         }
         
         # Fix SNR for height analysis
         fixed_snr_db = 20  # High SNR to see channel effects clearly
         
-        original_position = ScenarioConfig.UAV1_POSITION.copy()
+        original_position = ScenarioConfig.UAV1_POSITION
         
-        for height in height_range:
-            print(f"  Altura {height} m...", end="")
-            
-            # Move UAV to new height
-            new_position = [original_position[0], original_position[1], height]
-            self.scenario.move_uav("UAV1", new_position)
-            
-            # Recalculate paths for new position
-            paths = self.scenario.get_paths(max_depth=5)
-            
-            # Simulate at fixed SNR
-            # Update paths in system
-            self.paths = paths
-            metrics = self._simulate_single_snr(fixed_snr_db)
+        # Todas las alturas en un solo ray tracing (un receptor temporal por altura)
+        positions = np.empty((n, 3))
+        positions[:, 0] = original_position[0]
+        positions[:, 1] = original_position[1]
+        positions[:, 2] = height_range
+        paths, rx_idx = self.scenario.get_paths_batch(positions, max_depth=5)
+        
+        # LoS y ganancia son independientes dado paths: el análisis LoS corre en un hilo
+        # mientras se calcula la respuesta en frecuencia (las ops TF liberan el GIL)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            los_future = executor.submit(self.scenario.analyze_los_per_receiver, paths)
             
-            results['throughput_mbps'].append(metrics['throughput_mbps'])
-            results['path_loss_db'].append(-metrics['channel_gain_db'])  # Convert gain back to loss for display
-            results['spectral_efficiency'].append(metrics['spectral_efficiency'])
+            # Una sola respuesta en frecuencia y una reducción vectorizada -> [H]
+            h_freq, _ = self.scenario.get_channel_response(paths)
+            with tf.device(_TF_DEVICE):
+                channel_gain_db = _channel_gain_batch_kernel(h_freq, tf.constant(rx_idx, tf.int32),
+                                                             self._power_boost_lin)
+            channel_gain_db = channel_gain_db.numpy()
+            results['path_loss_db'][:] = -channel_gain_db  # Convert gain back to loss for display
             
             # LoS probability based on channel conditions
-            los_prob = 1.0 if metrics['channel_condition'] and metrics['channel_condition']['is_los'] else 0.0
-            results['los_probability'].append(los_prob)
-            
-            print(f" Throughput={metrics['throughput_mbps']:.1f} Mbps, LoS={'✓' if los_prob else '✗'}")
-        
-        # Restore original position
-        self.scenario.move_uav("UAV1", original_position)
-        
-        # Convert to numpy arrays
-        for key in ['throughput_mbps', 'path_loss_db', 'los_probability', 'spectral_efficiency']:
-            results[key] = np.array(results[key])
+            is_los = los_future.result()
+        results['los_probability'][:] = 0.0 if is_los is None else is_los[rx_idx]
+        
+        # Simulate at fixed SNR: todas las alturas en una sola llamada al kernel
+        results['throughput_mbps'], _, results['spectral_efficiency'] = _sweep(
+            np.full(n, float(fixed_snr_db)), 10.0 ** (-results['path_loss_db'] / 10.0),
+            self._mimo_gain, self._bw_mhz)
+        
+        if verbose:
+            # Resumen en una sola escritura a stdout
+            lines = [f"📈 Análisis de altura: {min(height_range)} a {max(height_range)} m"]
+            lines.extend(f"  Altura {height} m... Throughput={tp:.1f} Mbps, LoS={'✓' if los else '✗'}"
+                         for height, tp, los in zip(height_range, results['throughput_mbps'],
+                                                    results['los_probability']))
+            lines.append("✅ Análisis de altura completado")
+            sys.stdout.write("\n".join(lines) + "\n")
         
-        print("✅ Análisis de altura completado")
         return results
     
     def get_system_info(self):
@@ -211,7 +343,7 @@ class BasicUAVSystem:
             **scenario_info,
             'system_type': 'Basic UAV System',
             'channel_type': 'Ray Tracing',
-            'bandwidth_mhz': RFConfig.BANDWIDTH / 1e6,
+            'bandwidth_mhz': self._bw_mhz,
             'tx_power_dbm': RFConfig.TX_POWER_GNB,
             'batch_size': SimulationConfig.BATCH_SIZE
         }
@@ -234,7 +366,7 @@ def test_basic_system():
     # Quick throughput test
     print(f"\n🎯 TEST THROUGHPUT (SNR limitado para rapidez):")
     snr_test = [0, 10, 20]
-    results = system.simulate_throughput(snr_test)
+    results = system.simulate_throughput(snr_test, verbose=True)
     
     for i, snr in enumerate(snr_test):
         print(f"  SNR {snr} dB: {results['throughput_mbps'][i]:.1f} Mbps, BLER={results['bler'][i]:.3f}")
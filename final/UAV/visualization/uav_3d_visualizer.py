@@ -3,10 +3,86 @@ Visualizaciones 3D - Sistema UAV 5G NR
 Genera las vistas 3D del escenario Munich con UAVs, gNB y análisis de cobertura
 """
 import numpy as np
+import matplotlib as mpl
+mpl.use('Agg')  # Salida sólo a archivo: sin sondeo de backends GUI al importar pyplot
 import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+from matplotlib.colors import to_rgba
+from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
 import json
 import os
+from functools import cached_property
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from PIL import Image
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+# Simplificación de trayectos: descarta vértices sub-píxel al rasterizar las figuras con muchas líneas
+mpl.rcParams.update({'path.simplify': True, 'path.simplify_threshold': 1.0, 'agg.path.chunksize': 10000})
+
+USER_HEIGHT_M = 1.5  # Altura del usuario en el mapa de cobertura
+
+def _coverage_loop(X, Y, gnb_pos, relay_pos):
+    """
+    Cobertura por celda: max(directo, relay * 1.5) con modelo 1/(d^2+1)
+    Distancia, path loss y max fusionados en una sola pasada por celda
+    """
+    out = np.empty_like(X)
+    dx = relay_pos[0] - gnb_pos[0]
+    dy = relay_pos[1] - gnb_pos[1]
+    dz = relay_pos[2] - gnb_pos[2]
+    relay_gnb_term = dx*dx + dy*dy + dz*dz + 1.0
+    for i in prange(X.shape[0]):
+        for j in range(X.shape[1]):
+            # Distance to gNB (direct)
+            gx = X[i, j] - gnb_pos[0]
+            gy = Y[i, j] - gnb_pos[1]
+            gz = USER_HEIGHT_M - gnb_pos[2]
+            power_direct = 1000.0 / (gx*gx + gy*gy + gz*gz + 1.0)  # Simple path loss model
+            
+            # Distance via relay
+            rx = X[i, j] - relay_pos[0]
+            ry = Y[i, j] - relay_pos[1]
+            rz = USER_HEIGHT_M - relay_pos[2]
+            power_relay = 800.0 / ((rx*rx + ry*ry + rz*rz + 1.0) * relay_gnb_term)
+            
+            # Combined coverage (simplified)
+            out[i, j] = max(power_direct, power_relay * 1.5)  # Relay gain
+    return out
+
+if NUMBA_AVAILABLE:
+    # Firma explícita: se compila al importar (y queda en caché en disco)
+    _coverage_kernel = njit('float32[:, :](float32[:, :], float32[:, :], float32[:], float32[:])',
+                            parallel=True, fastmath=True, cache=True)(_coverage_loop)
+else:
+    def _coverage_kernel(X, Y, gnb_pos, relay_pos):
+        """Versión NumPy del kernel de cobertura (sin numba)"""
+        points = np.stack([X, Y, np.full_like(X, USER_HEIGHT_M)], axis=-1)
+        
+        # Distance to gNB (direct)
+        dist_gnb = np.linalg.norm(points - gnb_pos, axis=-1)
+        power_direct = 1000 / (dist_gnb**2 + 1)  # Simple path loss model
+        
+        # Distance via relay
+        dist_to_relay = np.linalg.norm(points - relay_pos, axis=-1)
+        dist_relay_gnb = np.linalg.norm(relay_pos - gnb_pos)
+        power_relay = 800 / ((dist_to_relay**2 + 1) * (dist_relay_gnb**2 + 1))
+        
+        # Combined coverage (simplified)
+        return np.maximum(power_direct, power_relay * 1.5)  # Relay gain
+
+def _write_png(rgba, path, dpi):
+    """Codificar y escribir un buffer RGBA ya renderizado como PNG (compresión rápida)"""
+    Image.fromarray(rgba).save(path, optimize=False, compress_level=1, dpi=(dpi, dpi))
+
+def _render_in_process(visualizer, method_name):
+    """Ejecutar un create_* en un proceso hijo (backend Agg, estado pyplot propio)"""
+    return getattr(visualizer, method_name)()
 
 class UAV3DVisualizer:
     """Generador de visualizaciones 3D para sistema UAV 5G NR"""
@@ -39,18 +115,25 @@ class UAV3DVisualizer:
             }
         }
         
+        # Coordenadas como arreglos contiguos (una fila por nodo), convertidas una sola vez
+        cfg = self.munich_config
+        self._uav_names = list(cfg['uav_positions'])
+        self._uav_xyz = np.asarray(list(cfg['uav_positions'].values()), dtype=np.float32)
+        self._gnb_xyz = np.asarray(cfg['gnb_position'], dtype=np.float32)
+        self._building_xyz = np.asarray(cfg['building_positions'], dtype=np.float32)
+        
+        # Escritor PNG en segundo plano (sólo activo dentro de generate_all_3d_visualizations)
+        self._png_writer = None
+        self._pending_writes = []
+        
         print("✅ Visualizador 3D inicializado")
         print(f"📁 Directorio de salida: {self.output_dir}")
     
-    def create_3d_scenario_view(self):
-        """Crear vista 3D completa del escenario Munich con mapa urbano realista"""
-        
-        fig = plt.figure(figsize=(18, 14))
-        ax = fig.add_subplot(111, projection='3d')
-        
+    @cached_property
+    def _ground_mesh(self):
+        """Terreno base (X, Y, Z): sólo depende del tamaño del área"""
         area = self.munich_config['area_size_m']
         
-        # ===== TERRENO URBANO MUNICH =====
         # Crear un mapa base más realista
         x_ground = np.linspace(0, area, 50)
         y_ground = np.linspace(0, area, 50)
@@ -58,6 +141,76 @@ class UAV3DVisualizer:
         
         # Terreno con variaciones (simulando calles y parques)
         Z_ground = 2 * np.sin(X_ground/100) * np.cos(Y_ground/100) + 1
+        return X_ground, Y_ground, Z_ground
+    
+    @cached_property
+    def _coverage_grid(self):
+        """Grilla (X, Y) del mapa de cobertura"""
+        area = self.munich_config['area_size_m']
+        # float32: plot_surface no necesita más precisión y la grilla ocupa la mitad
+        x = np.linspace(0, area, 50, dtype=np.float32)
+        y = np.linspace(0, area, 50, dtype=np.float32)
+        return np.meshgrid(x, y)
+    
+    @cached_property
+    def _mimo_pattern_meshes(self):
+        """Superficies (X, Y, Z) de los 4 patrones MIMO, cada una (4, 25, 50)"""
+        # Create antenna patterns (simplified radiation pattern)
+        theta = np.linspace(0, 2*np.pi, 50)
+        phi = np.linspace(0, np.pi, 25)
+        THETA, PHI = np.meshgrid(theta, phi)
+        sin_phi, cos_phi = np.sin(PHI), np.cos(PHI)
+        
+        # Different patterns for different MIMO configs -> R_all (4, 25, 50)
+        R_all = np.stack([
+            1 + 0.3 * cos_phi,                                  # SISO - omnidirectional
+            1 + 0.5 * np.cos(2*THETA) * sin_phi,                # 2x2 - slight directivity
+            1 + 0.7 * np.cos(4*THETA) * sin_phi**2,             # 4x4 - more focused
+            1 + 1.2 * np.cos(8*THETA) * sin_phi**3              # 8x4 - highly directional
+        ])
+        
+        # Convert to Cartesian coordinates (broadcast sobre las 4 configuraciones)
+        return (R_all * (sin_phi * np.cos(THETA)),
+                R_all * (sin_phi * np.sin(THETA)),
+                R_all * cos_phi)
+    
+    def _save_figure(self, fig, plot_path, dpi=300):
+        """
+        Rasterizar la figura, recortar márgenes vacíos y escribir el PNG
+        
+        Con un escritor activo la codificación/escritura del PNG se delega a un hilo
+        y se solapa con el render de la siguiente figura.
+        """
+        fig.set_dpi(dpi)
+        fig.canvas.draw()
+        
+        # Recorte equivalente a bbox_inches='tight' (pad 0.1 in) sobre el mismo render:
+        # bbox en pulgadas con origen abajo-izquierda -> filas/columnas del buffer
+        bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(0.1)
+        buf = np.asarray(fig.canvas.buffer_rgba())
+        height_px, width_px = buf.shape[:2]
+        x0 = max(int(np.floor(bbox.x0 * dpi)), 0)
+        x1 = min(int(np.ceil(bbox.x1 * dpi)), width_px)
+        y0 = max(height_px - int(np.ceil(bbox.y1 * dpi)), 0)
+        y1 = min(height_px - int(np.floor(bbox.y0 * dpi)), height_px)
+        rgba = buf[y0:y1, x0:x1].copy()  # Copia: el buffer se libera al cerrar la figura
+        plt.close(fig)
+        
+        if self._png_writer is None:
+            _write_png(rgba, plot_path, dpi)
+        else:
+            self._pending_writes.append(self._png_writer.submit(_write_png, rgba, plot_path, dpi))
+    
+    def create_3d_scenario_view(self):
+        """Crear vista 3D completa del escenario Munich con mapa urbano realista"""
+        
+        fig = plt.figure(figsize=(18, 14))
+        ax = fig.add_subplot(111, projection='3d')
+        
+        area = self.munich_config['area_size_m']
+        
+        # ===== TERRENO URBANO MUNICH =====
+        X_ground, Y_ground, Z_ground = self._ground_mesh
         ax.plot_surface(X_ground, Y_ground, Z_ground, alpha=0.3, color='lightgreen', 
                        linewidth=0, antialiased=True)
         
@@ -65,26 +218,33 @@ class UAV3DVisualizer:
         building_colors = ['#8B4513', '#696969', '#708090', '#2F4F4F', '#8FBC8F', '#CD853F']
         building_names = ['Edificio A', 'Edificio B', 'Edificio C', 'Edificio D', 'Edificio E', 'Edificio F']
         
+        building_size = 35  # Edificios más grandes
+        
+        # Crear edificios como prismas rectangulares: toda la geometría en dos colecciones
+        # Esquinas de la base (B, 4, 3) en z=0 y del techo en z=h
+        buildings = self._building_xyz
+        corner_offsets = building_size / 2 * np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]])
+        base = np.zeros((len(buildings), 4, 3))
+        base[..., :2] = buildings[:, None, :2] + corner_offsets
+        top = base.copy()
+        top[..., 2] = buildings[:, 2:3]
+        
+        # Caras: inferior, superior y 4 laterales por edificio -> (B*6, 4, 3)
+        nxt = [1, 2, 3, 0]
+        sides = np.stack([base, base[:, nxt], top[:, nxt], top], axis=2)  # (B, 4, 4, 3)
+        faces = np.concatenate([base[:, None], top[:, None], sides], axis=1).reshape(-1, 4, 3)
+        
+        # Edificio sólido con color distintivo
+        ax.add_collection3d(Poly3DCollection(faces, facecolors=np.repeat(building_colors, 6), shade=True,
+                                             alpha=0.7, edgecolors='black', linewidths=1))
+        
+        # Aristas: contorno inferior, superior y verticales -> (B*12, 2, 3)
+        edges = np.concatenate([np.stack([base, base[:, nxt]], axis=2),
+                                np.stack([top, top[:, nxt]], axis=2),
+                                np.stack([base, top], axis=2)], axis=1).reshape(-1, 2, 3)
+        ax.add_collection3d(Line3DCollection(edges, colors='k', alpha=0.8, linewidths=2))
+        
         for i, (x, y, h) in enumerate(self.munich_config['building_positions']):
-            building_size = 35  # Edificios más grandes
-            
-            # Crear edificio como prisma rectangular más realista
-            # Base del edificio
-            xx = [x-building_size/2, x+building_size/2, x+building_size/2, x-building_size/2, x-building_size/2]
-            yy = [y-building_size/2, y-building_size/2, y+building_size/2, y+building_size/2, y-building_size/2]
-            
-            # Cara inferior y superior
-            for z_level in [0, h]:
-                ax.plot(xx, yy, [z_level]*5, 'k-', alpha=0.8, linewidth=2)
-            
-            # Aristas verticales
-            for j in range(4):
-                ax.plot([xx[j], xx[j]], [yy[j], yy[j]], [0, h], 'k-', alpha=0.8, linewidth=2)
-            
-            # Edificio sólido con color distintivo
-            ax.bar3d(x-building_size/2, y-building_size/2, 0, building_size, building_size, h, 
-                    alpha=0.7, color=building_colors[i], edgecolor='black', linewidth=1)
-            
             # Etiqueta del edificio
             ax.text(x, y, h+5, f'{building_names[i]}\n{h}m', fontsize=9, ha='center', va='bottom',
                    bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8))
@@ -94,7 +254,7 @@ class UAV3DVisualizer:
         
         # Torre gNB más visible y realista
         ax.scatter([gnb_x], [gnb_y], [gnb_z], c='red', s=400, marker='^', 
-                  label='gNB Base Station (Torre 5G)', alpha=1.0, edgecolors='darkred', linewidth=3)
+                  label='gNB Base Station (Torre 5G)', alpha=1.0, edgecolors='darkred', linewidth=3, rasterized=True)
         
         # Torre de comunicación (mástil)
         ax.plot([gnb_x, gnb_x], [gnb_y, gnb_y], [0, gnb_z], 'darkred', linewidth=6, alpha=0.9)
@@ -102,10 +262,13 @@ class UAV3DVisualizer:
         # Patrón de cobertura gNB (sector beam más realista)
         sector_angles = np.linspace(-np.pi/3, np.pi/3, 20)  # 120° sector
         sector_radius = 150
-        for angle in sector_angles:
-            end_x = gnb_x + sector_radius * np.cos(angle + np.pi/4)  # 45° azimuth
-            end_y = gnb_y + sector_radius * np.sin(angle + np.pi/4)
-            ax.plot([gnb_x, end_x], [gnb_y, end_y], [gnb_z, gnb_z-10], 'r-', alpha=0.3, linewidth=1)
+        # Todos los rayos del sector en un solo artista: segmentos (20, 2, 3)
+        sector_rays = np.empty((len(sector_angles), 2, 3))
+        sector_rays[:, 0] = (gnb_x, gnb_y, gnb_z)
+        sector_rays[:, 1, 0] = gnb_x + sector_radius * np.cos(sector_angles + np.pi/4)  # 45° azimuth
+        sector_rays[:, 1, 1] = gnb_y + sector_radius * np.sin(sector_angles + np.pi/4)
+        sector_rays[:, 1, 2] = gnb_z - 10
+        ax.add_collection3d(Line3DCollection(sector_rays, colors='r', alpha=0.3, linewidths=1))
         
         # ===== UAVs CON REPRESENTACIÓN REALISTA =====
         uav_configs = {
@@ -115,24 +278,29 @@ class UAV3DVisualizer:
             'mesh_uav_2': {'color': 'purple', 'marker': 'v', 'label': 'UAV Mesh 2', 'size': 180}
         }
         
+        uav_xyz = self._uav_xyz
+        uav_colors = [uav_configs[uav_type]['color'] for uav_type in self._uav_names]
+        
+        # Hélices de todos los UAVs (4 rotores c/u) en un solo scatter
+        rotor_offset = 8
+        rotor_offsets = np.array([[rotor_offset, rotor_offset, 0], [-rotor_offset, rotor_offset, 0],
+                                  [rotor_offset, -rotor_offset, 0], [-rotor_offset, -rotor_offset, 0]])
+        rotor_xyz = (uav_xyz[:, None, :] + rotor_offsets[None, :, :]).reshape(-1, 3)
+        ax.scatter(rotor_xyz[:, 0], rotor_xyz[:, 1], rotor_xyz[:, 2],
+                   c=np.repeat(uav_colors, len(rotor_offsets)), s=30, marker='o', alpha=0.6, rasterized=True)
+        
+        # Líneas verticales desde el suelo (indicar altura) en un solo artista
+        height_lines = np.stack([uav_xyz * [1, 1, 0], uav_xyz], axis=1)
+        ax.add_collection3d(Line3DCollection(height_lines, colors=uav_colors, linestyles='--',
+                                             alpha=0.5, linewidths=2))
+        
         for uav_type, (x, y, z) in self.munich_config['uav_positions'].items():
             config = uav_configs[uav_type]
             
-            # UAV principal
+            # UAV principal (un scatter por UAV: cada uno tiene marcador y entrada de leyenda propios)
             ax.scatter([x], [y], [z], c=config['color'], s=config['size'], 
                       marker=config['marker'], label=config['label'], alpha=0.9, 
-                      edgecolors='black', linewidth=2)
-            
-            # Hélices del UAV (4 rotores)
-            rotor_offset = 8
-            rotor_positions = [(x+rotor_offset, y+rotor_offset, z), (x-rotor_offset, y+rotor_offset, z),
-                             (x+rotor_offset, y-rotor_offset, z), (x-rotor_offset, y-rotor_offset, z)]
-            
-            for rx, ry, rz in rotor_positions:
-                ax.scatter([rx], [ry], [rz], c=config['color'], s=30, marker='o', alpha=0.6)
-            
-            # Línea vertical desde el suelo (indicar altura)
-            ax.plot([x, x], [y, y], [0, z], '--', color=config['color'], alpha=0.5, linewidth=2)
+                      edgecolors='black', linewidth=2, rasterized=True)
             
             # Etiqueta de posición
             ax.text(x, y, z+8, f'{config["label"]}\n[{x},{y},{z}m]', 
@@ -141,30 +309,23 @@ class UAV3DVisualizer:
         
         # ===== ENLACES DE COMUNICACIÓN 5G =====
         # Enlaces directos gNB-UAVs
-        for uav_type, (x, y, z) in self.munich_config['uav_positions'].items():
-            if uav_type == 'user_uav':
-                # Enlace directo usuario (rojo punteado)
-                ax.plot([gnb_x, x], [gnb_y, y], [gnb_z, z], 'r--', linewidth=4, 
-                       alpha=0.8, label='Enlace Directo 5G')
-            elif uav_type == 'relay_uav':
-                # Enlaces relay (verde sólido) 
-                ax.plot([gnb_x, x], [gnb_y, y], [gnb_z, z], 'g-', linewidth=5, alpha=0.9)
-                user_x, user_y, user_z = self.munich_config['uav_positions']['user_uav']
-                ax.plot([x, user_x], [y, user_y], [z, user_z], 'g-', linewidth=5, 
-                       alpha=0.9, label='Enlaces Relay')
-        
-        # Enlaces mesh (naranja)
-        mesh_uavs = ['mesh_uav_1', 'mesh_uav_2']
-        user_pos = self.munich_config['uav_positions']['user_uav']
-        
-        for i, uav_type in enumerate(mesh_uavs):
-            x, y, z = self.munich_config['uav_positions'][uav_type]
-            
-            # Mesh a gNB
-            ax.plot([gnb_x, x], [gnb_y, y], [gnb_z, z], 'orange', linewidth=3, alpha=0.7)
-            # Mesh a usuario
-            ax.plot([x, user_pos[0]], [y, user_pos[1]], [z, user_pos[2]], 'orange', 
-                   linewidth=3, alpha=0.7, label='Red Mesh' if i == 0 else '')
+        uav = dict(zip(self._uav_names, self._uav_xyz))
+        gnb = self._gnb_xyz
+        
+        # Enlace directo usuario (rojo punteado)
+        ax.plot(*np.stack([gnb, uav['user_uav']], axis=1), 'r--', linewidth=4,
+               alpha=0.8, label='Enlace Directo 5G')
+        
+        # Enlaces relay (verde sólido): gNB -> relay -> usuario en un solo artista
+        ax.add_collection3d(Line3DCollection([(gnb, uav['relay_uav']), (uav['relay_uav'], uav['user_uav'])],
+                                             colors='g', linewidths=5, alpha=0.9, label='Enlaces Relay'))
+        
+        # Enlaces mesh (naranja): cada UAV mesh a gNB y a usuario -> segmentos (4, 2, 3)
+        mesh_xyz = np.stack([uav['mesh_uav_1'], uav['mesh_uav_2']])
+        mesh_links = np.stack([np.concatenate([np.broadcast_to(gnb, mesh_xyz.shape), mesh_xyz]),
+                               np.concatenate([mesh_xyz, np.broadcast_to(uav['user_uav'], mesh_xyz.shape)])], axis=1)
+        ax.add_collection3d(Line3DCollection(mesh_links, colors='orange', linewidths=3, alpha=0.7,
+                                             label='Red Mesh'))
         
         # Interconnexión mesh
         mesh1_pos = self.munich_config['uav_positions']['mesh_uav_1']
@@ -203,8 +364,7 @@ class UAV3DVisualizer:
         
         plt.tight_layout()
         plot_path = f"{self.output_dir}/scenario_3d_complete.png"
-        plt.savefig(plot_path, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        self._save_figure(fig, plot_path)
         
         return plot_path
     
@@ -215,59 +375,35 @@ class UAV3DVisualizer:
         ax = fig.add_subplot(111, projection='3d')
         
         # Create coverage grid
-        area = self.munich_config['area_size_m']
-        x = np.linspace(0, area, 50)
-        y = np.linspace(0, area, 50)
-        X, Y = np.meshgrid(x, y)
+        X, Y = self._coverage_grid
         
         # Simulate coverage based on distance from gNB and UAVs
-        gnb_pos = np.array(self.munich_config['gnb_position'])
-        relay_pos = np.array(self.munich_config['uav_positions']['relay_uav'])
-        
-        # Coverage calculation
-        Z_coverage = np.zeros_like(X)
-        for i in range(X.shape[0]):
-            for j in range(X.shape[1]):
-                point = np.array([X[i,j], Y[i,j], 1.5])  # 1.5m user height
-                
-                # Distance to gNB (direct)
-                dist_gnb = np.linalg.norm(point - gnb_pos)
-                power_direct = 1000 / (dist_gnb**2 + 1)  # Simple path loss model
-                
-                # Distance via relay
-                dist_to_relay = np.linalg.norm(point - relay_pos)
-                dist_relay_gnb = np.linalg.norm(relay_pos - gnb_pos)
-                power_relay = 800 / ((dist_to_relay**2 + 1) * (dist_relay_gnb**2 + 1))
-                
-                # Combined coverage (simplified)
-                Z_coverage[i,j] = max(power_direct, power_relay * 1.5)  # Relay gain
+        gnb_pos = self._gnb_xyz
+        relay_pos = self._uav_xyz[self._uav_names.index('relay_uav')]
+        
+        # Coverage calculation (kernel compilado, o NumPy vectorizado sin numba)
+        Z_coverage = _coverage_kernel(X, Y, gnb_pos, relay_pos)
         
         # Normalize to throughput-like values
-        Z_coverage = Z_coverage / np.max(Z_coverage) * 250  # Max 250 Mbps
+        Z_coverage *= 250.0 / Z_coverage.max()  # Max 250 Mbps (in-place, sin temporal)
         
-        # 3D surface plot
+        # 3D surface plot (colormap plano: sin iluminación por cuadrilátero ni antialiasing)
         surf = ax.plot_surface(X, Y, Z_coverage, cmap='viridis', alpha=0.8, 
-                              linewidth=0, antialiased=True)
-        
-        # Add buildings as obstacles (lower coverage)
-        for x, y, h in self.munich_config['building_positions']:
-            # Create coverage shadow
-            shadow_size = 40
-            x_shadow = np.linspace(x-shadow_size, x+shadow_size, 5)
-            y_shadow = np.linspace(y-shadow_size, y+shadow_size, 5)
-            X_shadow, Y_shadow = np.meshgrid(x_shadow, y_shadow)
-            Z_shadow = np.ones_like(X_shadow) * 10  # Low coverage
-            
-            ax.plot_surface(X_shadow, Y_shadow, Z_shadow, alpha=0.3, color='red')
+                              linewidth=0, antialiased=False, shade=False, rcount=50, ccount=50)
+        
+        # Add buildings as obstacles (lower coverage): todas las sombras en una sola colección
+        shadow_size = 40
+        buildings = self._building_xyz
+        shadow_quads = np.full((len(buildings), 4, 3), 10.0)  # Low coverage (z = 10)
+        shadow_quads[..., :2] = buildings[:, None, :2] + shadow_size * np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]])
+        ax.add_collection3d(Poly3DCollection(shadow_quads, facecolors='red', shade=True, alpha=0.3))
         
         # UAV positions
-        for uav_type, (x, y, z) in self.munich_config['uav_positions'].items():
-            ax.scatter([x], [y], [z], c='white', s=100, marker='o', 
-                      edgecolors='black', linewidth=2)
+        ax.scatter(self._uav_xyz[:, 0], self._uav_xyz[:, 1], self._uav_xyz[:, 2], c='white', s=100,
+                   marker='o', edgecolors='black', linewidth=2, rasterized=True)
         
         # gNB position
-        gnb_x, gnb_y, gnb_z = self.munich_config['gnb_position']
-        ax.scatter([gnb_x], [gnb_y], [gnb_z], c='red', s=200, marker='^')
+        ax.scatter(*self._gnb_xyz[:, None], c='red', s=200, marker='^', rasterized=True)
         
         # Styling
         ax.set_xlabel('X (metros)')
@@ -283,8 +419,7 @@ class UAV3DVisualizer:
         
         plt.tight_layout()
         plot_path = f"{self.output_dir}/coverage_heatmap_3d.png"
-        plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        self._save_figure(fig, plot_path)
         
         return plot_path
     
@@ -302,33 +437,15 @@ class UAV3DVisualizer:
         axes = [ax1, ax2, ax3, ax4]
         configs = ['SISO (1x1)', 'MIMO 2x2', 'MIMO 4x4', 'MIMO 8x4']
         
+        X_all, Y_all, Z_all = self._mimo_pattern_meshes
+        
         for idx, (ax, config) in enumerate(zip(axes, configs)):
-            # Create antenna pattern (simplified radiation pattern)
-            theta = np.linspace(0, 2*np.pi, 50)
-            phi = np.linspace(0, np.pi, 25)
-            THETA, PHI = np.meshgrid(theta, phi)
-            
-            # Different patterns for different MIMO configs
-            if idx == 0:  # SISO - omnidirectional
-                R = 1 + 0.3 * np.cos(PHI)
-            elif idx == 1:  # 2x2 - slight directivity
-                R = 1 + 0.5 * np.cos(2*THETA) * np.sin(PHI)
-            elif idx == 2:  # 4x4 - more focused
-                R = 1 + 0.7 * np.cos(4*THETA) * np.sin(PHI)**2
-            else:  # 8x4 - highly directional
-                R = 1 + 1.2 * np.cos(8*THETA) * np.sin(PHI)**3
-            
-            # Convert to Cartesian coordinates
-            X = R * np.sin(PHI) * np.cos(THETA)
-            Y = R * np.sin(PHI) * np.sin(THETA)
-            Z = R * np.cos(PHI)
-            
             # Plot surface
-            surf = ax.plot_surface(X, Y, Z, cmap='plasma', alpha=0.7, 
+            surf = ax.plot_surface(X_all[idx], Y_all[idx], Z_all[idx], cmap='plasma', alpha=0.7, 
                                   linewidth=0, antialiased=True)
             
             # Center point (antenna)
-            ax.scatter([0], [0], [0], c='black', s=50, marker='o')
+            ax.scatter([0], [0], [0], c='black', s=50, marker='o', rasterized=True)
             
             ax.set_title(config, fontweight='bold')
             ax.set_xlabel('X')
@@ -348,8 +465,7 @@ class UAV3DVisualizer:
         plt.tight_layout()
         
         plot_path = f"{self.output_dir}/mimo_patterns_3d.png"
-        plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        self._save_figure(fig, plot_path)
         
         return plot_path
     
@@ -360,70 +476,48 @@ class UAV3DVisualizer:
         
         topologies = ['Direct', 'Relay', 'Mesh 2-hop', 'Mesh 3-hop', 'Cooperative']
         
+        # Enlaces por topología: (origen, destino, color, ancho, alpha, estilo)
+        topology_links = {
+            # Only gNB to User
+            'Direct': [('gnb', 'user_uav', 'b', 3, 0.8, '-')],
+            # gNB -> Relay -> User
+            'Relay': [('gnb', 'relay_uav', 'g', 3, 0.8, '-'),
+                      ('relay_uav', 'user_uav', 'g', 3, 0.8, '-')],
+            # gNB -> Mesh1 -> User
+            'Mesh 2-hop': [('gnb', 'mesh_uav_1', 'orange', 3, 0.8, '-'),
+                           ('mesh_uav_1', 'user_uav', 'orange', 3, 0.8, '-')],
+            # gNB -> Mesh1 -> Mesh2 -> User
+            'Mesh 3-hop': [('gnb', 'mesh_uav_1', 'purple', 2, 0.8, '-'),
+                           ('mesh_uav_1', 'mesh_uav_2', 'purple', 2, 0.8, '-'),
+                           ('mesh_uav_2', 'user_uav', 'purple', 2, 0.8, '-')],
+            # Multiple paths: gNB -> Relay -> User, gNB -> Mesh1 -> User y enlace de cooperación
+            'Cooperative': [('gnb', 'relay_uav', 'g', 2, 0.8, '-'),
+                            ('relay_uav', 'user_uav', 'g', 2, 0.8, '-'),
+                            ('gnb', 'mesh_uav_1', 'orange', 2, 0.6, '-'),
+                            ('mesh_uav_1', 'user_uav', 'orange', 2, 0.6, '-'),
+                            ('relay_uav', 'mesh_uav_1', 'cyan', 1, 0.5, '--')]
+        }
+        
+        nodes = {'gnb': self._gnb_xyz, **dict(zip(self._uav_names, self._uav_xyz))}
+        
         for idx, topology in enumerate(topologies):
             ax = fig.add_subplot(2, 3, idx+1, projection='3d')
             
-            # Base positions
-            gnb_pos = self.munich_config['gnb_position']
-            uav_positions = self.munich_config['uav_positions']
-            
             # Plot all nodes
-            ax.scatter(*gnb_pos, c='red', s=200, marker='^', label='gNB')
+            ax.scatter(*self._gnb_xyz, c='red', s=200, marker='^', label='gNB', rasterized=True)
             
             colors = ['blue', 'green', 'orange', 'purple']
-            for i, (uav_type, pos) in enumerate(uav_positions.items()):
+            for i, (uav_type, pos) in enumerate(zip(self._uav_names, self._uav_xyz)):
                 ax.scatter(*pos, c=colors[i], s=100, marker='o', 
-                          label=uav_type.replace('_', ' ').title())
+                          label=uav_type.replace('_', ' ').title(), rasterized=True)
             
-            # Draw connections based on topology
-            user_pos = uav_positions['user_uav']
-            relay_pos = uav_positions['relay_uav']
-            mesh1_pos = uav_positions['mesh_uav_1']
-            mesh2_pos = uav_positions['mesh_uav_2']
-            
-            if topology == 'Direct':
-                # Only gNB to User
-                ax.plot([gnb_pos[0], user_pos[0]], [gnb_pos[1], user_pos[1]], 
-                       [gnb_pos[2], user_pos[2]], 'b-', linewidth=3, alpha=0.8)
-                
-            elif topology == 'Relay':
-                # gNB -> Relay -> User
-                ax.plot([gnb_pos[0], relay_pos[0]], [gnb_pos[1], relay_pos[1]], 
-                       [gnb_pos[2], relay_pos[2]], 'g-', linewidth=3, alpha=0.8)
-                ax.plot([relay_pos[0], user_pos[0]], [relay_pos[1], user_pos[1]], 
-                       [relay_pos[2], user_pos[2]], 'g-', linewidth=3, alpha=0.8)
-                
-            elif topology == 'Mesh 2-hop':
-                # gNB -> Mesh1 -> User
-                ax.plot([gnb_pos[0], mesh1_pos[0]], [gnb_pos[1], mesh1_pos[1]], 
-                       [gnb_pos[2], mesh1_pos[2]], 'orange', linewidth=3, alpha=0.8)
-                ax.plot([mesh1_pos[0], user_pos[0]], [mesh1_pos[1], user_pos[1]], 
-                       [mesh1_pos[2], user_pos[2]], 'orange', linewidth=3, alpha=0.8)
-                
-            elif topology == 'Mesh 3-hop':
-                # gNB -> Mesh1 -> Mesh2 -> User
-                ax.plot([gnb_pos[0], mesh1_pos[0]], [gnb_pos[1], mesh1_pos[1]], 
-                       [gnb_pos[2], mesh1_pos[2]], 'purple', linewidth=2, alpha=0.8)
-                ax.plot([mesh1_pos[0], mesh2_pos[0]], [mesh1_pos[1], mesh2_pos[1]], 
-                       [mesh1_pos[2], mesh2_pos[2]], 'purple', linewidth=2, alpha=0.8)
-                ax.plot([mesh2_pos[0], user_pos[0]], [mesh2_pos[1], user_pos[1]], 
-                       [mesh2_pos[2], user_pos[2]], 'purple', linewidth=2, alpha=0.8)
-                
-            elif topology == 'Cooperative':
-                # Multiple paths
-                # gNB -> Relay -> User
-                ax.plot([gnb_pos[0], relay_pos[0]], [gnb_pos[1], relay_pos[1]], 
-                       [gnb_pos[2], relay_pos[2]], 'g-', linewidth=2, alpha=0.8)
-                ax.plot([relay_pos[0], user_pos[0]], [relay_pos[1], user_pos[1]], 
-                       [relay_pos[2], user_pos[2]], 'g-', linewidth=2, alpha=0.8)
-                # gNB -> Mesh1 -> User
-                ax.plot([gnb_pos[0], mesh1_pos[0]], [gnb_pos[1], mesh1_pos[1]], 
-                       [gnb_pos[2], mesh1_pos[2]], 'orange', linewidth=2, alpha=0.6)
-                ax.plot([mesh1_pos[0], user_pos[0]], [mesh1_pos[1], user_pos[1]], 
-                       [mesh1_pos[2], user_pos[2]], 'orange', linewidth=2, alpha=0.6)
-                # Cooperation links
-                ax.plot([relay_pos[0], mesh1_pos[0]], [relay_pos[1], mesh1_pos[1]], 
-                       [relay_pos[2], mesh1_pos[2]], 'cyan', linewidth=1, alpha=0.5, linestyle='--')
+            # Draw connections based on topology: todos los enlaces del subplot en una colección
+            links = topology_links[topology]
+            ax.add_collection3d(Line3DCollection(
+                [(nodes[src], nodes[dst]) for src, dst, *_ in links],
+                colors=[to_rgba(color, alpha) for _, _, color, _, alpha, _ in links],
+                linewidths=[width for _, _, _, width, _, _ in links],
+                linestyles=[style for *_, style in links]))
             
             ax.set_title(f'{topology} Topology', fontweight='bold')
             ax.set_xlabel('X (m)')
@@ -444,33 +538,52 @@ class UAV3DVisualizer:
         plt.tight_layout()
         
         plot_path = f"{self.output_dir}/network_topologies_3d.png"
-        plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        self._save_figure(fig, plot_path)
         
         return plot_path
     
-    def generate_all_3d_visualizations(self):
-        """Generar todas las visualizaciones 3D"""
+    def generate_all_3d_visualizations(self, max_workers=4):
+        """
+        Generar todas las visualizaciones 3D
         
-        print("\n🎨 GENERANDO VISUALIZACIONES 3D COMPLETAS...")
+        Args:
+            max_workers: Procesos para renderizar las figuras (independientes entre sí),
+                1 = ejecución secuencial
+        """
         
-        generated_files = {}
-        
-        # Scenario overview
-        print("📍 Vista 3D del escenario...")
-        generated_files['scenario'] = self.create_3d_scenario_view()
-        
-        # Coverage heatmap
-        print("🗺️  Mapa de cobertura 3D...")
-        generated_files['coverage'] = self.create_coverage_heatmap_3d()
+        print("\n🎨 GENERANDO VISUALIZACIONES 3D COMPLETAS...")
         
-        # MIMO patterns
-        print("📡 Patrones MIMO 3D...")
-        generated_files['mimo'] = self.create_mimo_beamforming_3d()
+        tasks = {
+            'scenario': ("📍 Vista 3D del escenario...", 'create_3d_scenario_view'),
+            'coverage': ("🗺️  Mapa de cobertura 3D...", 'create_coverage_heatmap_3d'),
+            'mimo': ("📡 Patrones MIMO 3D...", 'create_mimo_beamforming_3d'),
+            'topologies': ("🕸️  Topologías de red 3D...", 'create_network_topology_3d')
+        }
         
-        # Network topologies
-        print("🕸️  Topologías de red 3D...")
-        generated_files['topologies'] = self.create_network_topology_3d()
+        for message, _ in tasks.values():
+            print(message)
+        
+        # Sin núcleos extra el pool sólo añade el arranque de los procesos
+        max_workers = min(max_workers, len(tasks), os.cpu_count() or 1)
+        if max_workers <= 1:
+            # Los PNG se escriben en un hilo mientras se renderiza la siguiente figura
+            with ThreadPoolExecutor(max_workers=1) as self._png_writer:
+                try:
+                    generated_files = {name: getattr(self, method)() for name, (_, method) in tasks.items()}
+                    for future in wait(self._pending_writes).done:
+                        future.result()  # Propagar errores de escritura
+                finally:
+                    self._png_writer = None
+                    self._pending_writes = []
+        else:
+            # Render + compresión PNG son CPU-bound: un proceso por figura
+            # spawn: cada hijo importa matplotlib/numba desde cero (fork con el pool
+            # de hilos de numba ya inicializado puede bloquear la salida del proceso)
+            with ProcessPoolExecutor(max_workers=max_workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = {name: pool.submit(_render_in_process, self, method)
+                           for name, (_, method) in tasks.items()}
+                generated_files = {name: future.result() for name, future in futures.items()}
         
         print(f"\n✅ VISUALIZACIONES 3D COMPLETADAS!")
         print(f"📁 Archivos guardados en: {self.output_dir}")
@@ -10,27 +10,36 @@ print("="*60)
 
 # 1. Verificar GPU
 gpus = tf.config.list_physical_devices('GPU')
+compute_dtype = tf.bfloat16  # CPU (oneDNN) y GPUs Ampere+ soportan BF16
 if gpus:
     print(f"GPU DETECTADA: {len(gpus)} dispositivo(s)")
     details = tf.config.experimental.get_device_details(gpus[0])
     print(f"   Nombre: {details.get('device_name', 'Desconocido')}")
     print(f"   Compute Capability: {details.get('compute_capability', 'N/A')}")
+    if details.get('compute_capability', (0, 0)) < (8, 0):
+        compute_dtype = tf.float16  # Tensor cores sin BF16 (pre-Ampere)
 else:
     print("ERROR CRÍTICO: No se detecta GPU. Sionna será muy lento.")
 
 # 2. Verificar XLA (Aceleración de compilación)
-print("\nProbando compilación XLA (jit_compile)...")
+# FP32 es la ruta que usa Sionna; BF16/FP16 comprueba además los tensor cores
+print(f"\nProbando compilación XLA (jit_compile, float32 y {compute_dtype.name})...")
 try:
-    @tf.function(jit_compile=True)
+    @tf.function(jit_compile=True, reduce_retracing=True)
     def test_xla(x, y):
         return tf.matmul(x, y)
 
-    a = tf.random.normal((100, 100))
-    b = tf.random.normal((100, 100))
-    # Primera ejecución (compilación)
-    _ = test_xla(a, b)
-    # Segunda ejecución (caché)
-    _ = test_xla(a, b)
+    for dtype in (tf.float32, compute_dtype):
+        # Función concreta obtenida una vez: las llamadas no pasan por el dispatch de tf.function
+        spec = tf.TensorSpec((100, 100), dtype)
+        test_xla_cf = test_xla.get_concrete_function(spec, spec)
+
+        a = tf.cast(tf.random.normal((100, 100)), dtype)
+        b = tf.cast(tf.random.normal((100, 100)), dtype)
+        # Primera ejecución (compilación)
+        _ = test_xla_cf(a, b)
+        # Segunda ejecución (caché)
+        _ = test_xla_cf(a, b)
     print("XLA Funciona correctamente (Tu GPU está procesando grafos optimizados).")
 except Exception as e:
     print(f"Error en XLA: {e}")
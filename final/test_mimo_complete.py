@@ -2,55 +2,180 @@
 """
 Test completo de la integración MIMO + 3D
 """
+import gzip
+import hashlib
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 
-def test_mimo_complete():
-    """Test limpio de la integración completa"""
+# Código que determina los resultados en caché: si cambia, la caché deja de valer
+_ANALYSED_SOURCES = (
+    'GUI/analysis/mimo_beamforming_gui.py',
+    'UAV/systems/basic_system.py',
+    'UAV/scenarios/munich_uav_scenario.py',
+    'UAV/analysis/mimo_beamforming_analysis.py',
+    'UAV/config/system_config.py',
+)
+
+def _sources_fingerprint():
+    """Hash del contenido de _ANALYSED_SOURCES (relativos a este archivo)"""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.blake2b(digest_size=16)
+    for rel_path in _ANALYSED_SOURCES:
+        h.update(rel_path.encode())
+        try:
+            with open(os.path.join(base_dir, rel_path), 'rb') as f:
+                h.update(f.read())
+        except FileNotFoundError:
+            h.update(b'<missing>')
+    return h.hexdigest()
+
+def _cached_analysis(analysis, method_name, config):
+    """
+    Ejecutar un analyze_* con caché en disco (outputs/.cache)
+    
+    La clave es un hash de la configuración y del código fuente analizado
+    (_ANALYSED_SOURCES), así un cambio en la simulación invalida la caché; con
+    MIMO_TEST_NOCACHE=1 siempre se recalcula (ruta completa con Sionna RT).
+    """
+    if os.environ.get('MIMO_TEST_NOCACHE') == '1':
+        return getattr(analysis, method_name)()
+    
+    key = hashlib.blake2b(repr((method_name, config, analysis.munich_config,
+                                _sources_fingerprint())).encode(),
+                          digest_size=16).hexdigest()
+    cache_path = os.path.join(analysis.output_dir, '.cache', f'{key}.pkl.gz')
+    try:
+        with gzip.open(cache_path, 'rb') as f:
+            results = pickle.load(f)
+        print(f"♻️ {method_name}: resultados en caché ({os.path.basename(cache_path)})")
+        return results
+    except FileNotFoundError:
+        pass
+    
+    results = getattr(analysis, method_name)()
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with gzip.open(cache_path, 'wb') as f:
+        pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return results
+
+def _file_size(path):
+    """Tamaño del archivo en bytes con un solo stat(), o None si no existe"""
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return None
+
+def _init_worker():
+    """
+    Inicializador de los procesos hijo: memoria GPU bajo demanda, para que
+    varios runtimes TF puedan compartir la GPU sin reservarla entera cada uno
+    """
+    import tensorflow as tf
+    for gpu in tf.config.list_physical_devices('GPU'):
+        try:
+            tf.config.experimental.set_memory_growth(gpu, True)
+        except RuntimeError as e:
+            print(f"GPU setup warning: {e}")
+
+# Etapas ejecutables en un proceso hijo: funciones de módulo (picklables) que
+# reconstruyen el análisis dentro del worker y devuelven sólo datos
+def _run_mimo_analysis(output_dir):
+    from GUI.analysis.mimo_beamforming_gui import MIMOBeamformingGUI
+    analysis = MIMOBeamformingGUI(output_dir)
+    return _cached_analysis(analysis, 'analyze_mimo_configurations_with_sionna', analysis.mimo_configs)
+
+def _run_beamforming_analysis(output_dir):
+    from GUI.analysis.mimo_beamforming_gui import MIMOBeamformingGUI
+    analysis = MIMOBeamformingGUI(output_dir)
+    return _cached_analysis(analysis, 'analyze_beamforming_strategies_with_sionna',
+                            analysis.beamforming_strategies)
+
+def _run_plots(output_dir, mimo_results, beamforming_results):
+    from GUI.analysis.mimo_beamforming_gui import MIMOBeamformingGUI
+    MIMOBeamformingGUI(output_dir).generate_mimo_sionna_plots(mimo_results, beamforming_results)
+
+def test_mimo_complete(max_workers=1):
+    """
+    Test limpio de la integración completa
+    
+    Args:
+        max_workers: Procesos para las etapas independientes (análisis MIMO y
+            beamforming; gráficos en paralelo al JSON), 1 = ejecución secuencial.
+            Se limita al número de CPUs: cada proceso reconstruye escena y sistema
+    """
     
     print("🚀 TESTING MIMO COMPLETE INTEGRATION")
     
+    pool = None
     try:
         from GUI.analysis.mimo_beamforming_gui import MIMOBeamformingGUI
-        import os
         
         # Initialize
         analysis = MIMOBeamformingGUI("outputs")
         print("✅ Analysis initialized")
         
-        # Run MIMO analysis
-        print("🔄 Running MIMO analysis...")
-        mimo_results = analysis.analyze_mimo_configurations_with_sionna()
-        print(f"✅ MIMO complete: {len(mimo_results)} configurations")
+        max_workers = min(max_workers, os.cpu_count() or 1)
+        if max_workers > 1:
+            # spawn: cada proceso crea su propio runtime TF / contexto CUDA
+            pool = ProcessPoolExecutor(max_workers=max_workers,
+                                       mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=_init_worker)
         
-        # Run beamforming analysis  
+        # MIMO y beamforming no dependen entre sí: se lanzan a la vez
+        print("🔄 Running MIMO analysis...")
         print("🔄 Running beamforming analysis...")
-        beamforming_results = analysis.analyze_beamforming_strategies_with_sionna()
+        if pool is not None:
+            mimo_future = pool.submit(_run_mimo_analysis, analysis.output_dir)
+            beamforming_future = pool.submit(_run_beamforming_analysis, analysis.output_dir)
+            mimo_results = mimo_future.result()
+            beamforming_results = beamforming_future.result()
+        else:
+            mimo_results = _cached_analysis(analysis, 'analyze_mimo_configurations_with_sionna',
+                                            analysis.mimo_configs)
+            beamforming_results = _cached_analysis(analysis, 'analyze_beamforming_strategies_with_sionna',
+                                                   analysis.beamforming_strategies)
+        print(f"✅ MIMO complete: {len(mimo_results)} configurations")
         print(f"✅ Beamforming complete: {len(beamforming_results)} strategies")
         
         # Generate 3D visualization
         print("🔄 Generating 3D scene...")
         scene_3d_path = analysis.generate_3d_visualization(mimo_results, beamforming_results)
         
-        if scene_3d_path and os.path.exists(scene_3d_path):
-            size = os.path.getsize(scene_3d_path)
+        size = _file_size(scene_3d_path) if scene_3d_path else None
+        if size is not None:
             print(f"✅ 3D Scene generated: {scene_3d_path} ({size:,} bytes)")
         else:
             print("❌ 3D Scene generation failed")
             return False
         
-        # Generate plots (attempt)
+        # Generate plots (attempt): en el pool mientras se guarda el JSON
         print("🔄 Attempting plot generation...")
-        try:
-            fig = analysis.generate_mimo_sionna_plots(mimo_results, beamforming_results)
-            print("✅ Plots generated successfully")
-        except Exception as e:
-            print(f"⚠️ Plot generation failed: {e}")
-            # Continue anyway
+        plots_future = None
+        if pool is not None:
+            plots_future = pool.submit(_run_plots, analysis.output_dir, mimo_results, beamforming_results)
+        else:
+            try:
+                analysis.generate_mimo_sionna_plots(mimo_results, beamforming_results)
+                print("✅ Plots generated successfully")
+            except Exception as e:
+                print(f"⚠️ Plot generation failed: {e}")
+                # Continue anyway
         
         # Save results
         print("🔄 Saving results...")
         json_data = analysis.save_results_json(mimo_results, beamforming_results)
         print("✅ Results saved")
         
+        if plots_future is not None:
+            try:
+                plots_future.result()
+                print("✅ Plots generated successfully")
+            except Exception as e:
+                print(f"⚠️ Plot generation failed: {e}")
+                # Continue anyway
+        
         # Generate summary
         summary = analysis.generate_summary_report(mimo_results, beamforming_results)
         
@@ -74,8 +199,9 @@ def test_mimo_complete():
         
         # Verify files exist
         for path in result['scene_3d']:
-            if os.path.exists(path):
-                print(f"   ✅ Scene file: {os.path.basename(path)} ({os.path.getsize(path):,} bytes)")
+            size = _file_size(path)
+            if size is not None:
+                print(f"   ✅ Scene file: {os.path.basename(path)} ({size:,} bytes)")
         
         print(f"\n🚀 GUI INTEGRATION READY!")
         print(f"   The GUI should now display 3D scenes in the MIMO tab.")
@@ -87,6 +213,9 @@ def test_mimo_complete():
         import traceback
         traceback.print_exc()
         return None
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
 if __name__ == "__main__":
     test_mimo_complete()
\ No newline at end of file
@@ -11,8 +11,16 @@ import sionna
 from sionna.rt import Transmitter, Receiver, PathSolver, PlanarArray, load_scene, Camera
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FuncFormatter
+from PIL import Image
 import os
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 tf.get_logger().setLevel("INFO")
 
@@ -76,16 +84,63 @@ class RFNR_Config:
     BANDWIDTH = 20e6           # 20 MHz
     SUBCARRIER_SPACING = 15e3  # 15 kHz
     NUM_SUBCARRIERS = int(BANDWIDTH / SUBCARRIER_SPACING)
+    CFR_CHUNK_SUBCARRIERS = 256  # Subcarriers per CFR evaluation (bounds GPU memory)
 
 class ScenarioConfig:
     """3D scenario configuration for Munich"""
     GNB_POSITION = [110, 70, 20]      # gNB base station
     UAV1_POSITION = [50, 150, 35]    # Initial UAV position
 
+TX_POWER_DBM = 35.0                            # 5G typical TX power
+_TX_POWER_W = 10 ** ((TX_POWER_DBM - 30) / 10)  # dBm -> W, evaluated once
+_LOG2_INV = 1.4426950408889634                 # 1/ln(2): log2(x) = ln(x) * _LOG2_INV
+_DB_TO_LN = 0.23025850929940458                # ln(10)/10: 10^(x/10) = exp(x * _DB_TO_LN)
+_K_BOLTZMANN = 1.38064852e-23                  # J/K
+NOISE_FIGURE_DB = 7.0                          # UAV receiver noise figure
+NOISE_TEMP_K = 290
+# k*T*B*NF at the default RF config (the sweep always uses it), evaluated once
+_THERMAL_NOISE_DEFAULT = (_K_BOLTZMANN * NOISE_TEMP_K * RFNR_Config.BANDWIDTH
+                          * 10 ** (NOISE_FIGURE_DB / 10))
+
 ########################################
 # BEAMFORMING FUNCTIONS
 ########################################
 
+def svd_multistream_beamforming_batch(H_batch, num_streams_max=None, beamforming_rank=None):
+    """
+    Batched SVD beamforming: one np.linalg.svd call over stacked channel matrices
+    
+    H_batch: Channel matrices [num_heights, rx_antennas, tx_antennas]
+    num_streams_max, beamforming_rank: as in svd_multistream_beamforming
+    
+    Returns: (V, S_all, U, num_valid_streams, S_active), each with a leading batch axis
+    """
+    # Single gufunc call: LAPACK dispatch amortized over all matrices
+    U, S, Vh = np.linalg.svd(H_batch, full_matrices=False)
+    
+    # Clamp small singular values to prevent numerical issues (threshold per matrix)
+    S_threshold = np.max(S, axis=-1, keepdims=True) * 1e-5
+    S_clamped = np.maximum(S, S_threshold)
+    
+    # Cap number of streams
+    max_rank = min(U.shape[-1], Vh.shape[-2])
+    if num_streams_max is not None:
+        max_rank = min(max_rank, num_streams_max)
+    
+    # PROBLEMA 2 FIX: Select rank for beamforming vs spatial multiplexing
+    if beamforming_rank == 1:
+        # Beamforming: use only the strongest singular value
+        active_rank = 1
+    else:
+        # Spatial multiplexing: use all available streams up to max_rank
+        active_rank = max_rank
+    
+    # Count valid streams (S > threshold)
+    valid_streams = np.sum(S_clamped > S_threshold, axis=-1)
+    
+    # Return: all singular values (for reference) + active ones for SINR calc
+    return np.swapaxes(Vh, -1, -2), S_clamped, U, valid_streams, S_clamped[..., :active_rank]
+
 def svd_multistream_beamforming(H, num_streams_max=None, beamforming_rank=None):
     """
     SVD-based multi-stream beamforming using NumPy (workaround for TensorFlow rectangular matrix bug)
@@ -100,62 +155,53 @@ def svd_multistream_beamforming(H, num_streams_max=None, beamforming_rank=None):
     try:
         # Use NumPy for SVD to avoid TensorFlow rectangular matrix bug
         H_np = H.numpy() if hasattr(H, 'numpy') else H
-        U, S, Vh = np.linalg.svd(H_np, full_matrices=False)
-        
-        # Clamp small singular values to prevent numerical issues
-        S_threshold = np.max(S) * 1e-5
-        S_clamped = np.maximum(S, S_threshold)
-        
-        # Cap number of streams
-        max_rank = min(U.shape[1], Vh.shape[0])
-        if num_streams_max is not None:
-            max_rank = min(max_rank, num_streams_max)
-        
-        # PROBLEMA 2 FIX: Select rank for beamforming vs spatial multiplexing
-        if beamforming_rank == 1:
-            # Beamforming: use only the strongest singular value
-            active_rank = 1
-        else:
-            # Spatial multiplexing: use all available streams up to max_rank
-            active_rank = max_rank
-        
-        # Count valid streams (S > threshold)
-        valid_streams = np.sum(S_clamped > S_threshold)
-        
-        # Return: all singular values (for reference) + active ones for SINR calc
-        return Vh.T, S_clamped, U, valid_streams, S_clamped[:active_rank]
+        V, S_clamped, U, valid_streams, S_active = svd_multistream_beamforming_batch(
+            H_np[np.newaxis], num_streams_max, beamforming_rank
+        )
+        return V[0], S_clamped[0], U[0], valid_streams[0], S_active[0]
         
     except Exception as e:
         print(f"SVD error: {e}")
         traceback.print_exc()
         return None, None, None, 0, np.array([-50.0])
 
-def mrc_beamforming(H):
-    """Maximum Ratio Combining beamforming"""
-    H_conj_T = tf.transpose(tf.math.conj(H))
-    # MRC: beamforming vector is conjugate of dominant right singular vector
-    _, _, Vh = tf.linalg.svd(H, full_matrices=False)
-    v_mrc = Vh[-1, :]  # Dominant right singular vector
+def mrc_beamforming(H, S=None, noise_power=1.0):
+    """
+    Maximum Ratio Combining beamforming
+    
+    S: Singular values of H if already computed, e.g. by
+       svd_multistream_beamforming_batch; None = compute them here
+    noise_power: Noise power in the same (linear) units as |H|^2
+    """
+    # MRC: beamforming vector is the dominant right singular vector v_1, and
+    # H v_1 = sigma_1 u_1, so ||H v_1|| = S[0] without any matmul
+    if S is None:
+        S = np.linalg.svd(H.numpy(), compute_uv=False)
+    channel_gain = tf.constant(S[0], dtype=tf.float32)
     
     # SINR calculation
-    channel_gain = tf.norm(tf.matmul(H, tf.expand_dims(v_mrc, 1)))
-    interference = tf.norm(tf.matmul(H, tf.expand_dims(v_mrc, 1))) / tf.cast(H.shape[0], tf.float32)
-    sinr = (channel_gain ** 2) / (1.0 + interference)
+    sinr = (channel_gain ** 2) / noise_power
     sinr_db = 10 * tf.math.log10(sinr + 1e-10)
     sinr_db = tf.clip_by_value(sinr_db, -50.0, 50.0)  # CRITICAL: Clip
     
     return sinr_db
 
+# Channel matrices are complex64 [rx_antennas, tx_antennas]; the kernels below are
+# traced/compiled by XLA once per array shape and reused for every height
+_H_SPEC = tf.TensorSpec([None, None], tf.complex64)
+
+@tf.function(jit_compile=True, input_signature=[_H_SPEC])
 def zero_forcing_precoding(H):
     """
     Zero Forcing (ZF) Precoding - W = H^H (H H^H)^-1
     
     Cancels Inter-Stream Interference, optimal for spatial multiplexing
     """
-    H_h = tf.transpose(tf.math.conj(H))
-    HH_h = tf.matmul(H, H_h)
-    HH_h_inv = tf.linalg.inv(HH_h + 1e-8 * tf.eye(tf.shape(HH_h)[0], dtype=H.dtype))
-    W = tf.matmul(H_h, HH_h_inv)
+    HH_h = tf.matmul(H, H, adjoint_b=True)  # H H^H without materializing H^H
+    # H H^H + eps*I is Hermitian positive definite: Cholesky solve instead of an
+    # explicit inverse. (A^-1 is Hermitian, so H^H A^-1 = (A^-1 H)^H)
+    L = tf.linalg.cholesky(HH_h + 1e-8 * tf.eye(tf.shape(HH_h)[0], dtype=H.dtype))
+    W = tf.linalg.adjoint(tf.linalg.cholesky_solve(L, H))
     
     # Normalize columns to unit power
     col_norms = tf.sqrt(tf.reduce_sum(tf.abs(W)**2, axis=0, keepdims=True) + 1e-10)
@@ -164,25 +210,30 @@ def zero_forcing_precoding(H):
     
     return W_normalized
 
+@tf.function(jit_compile=True, input_signature=[_H_SPEC])
+def _zero_forcing_sinr_kernel(H):
+    """ZF precoding + per-stream SINR in a single XLA graph"""
+    W = zero_forcing_precoding(H)
+    
+    # Effective channel after ZF
+    H_eff = tf.matmul(H, W)
+    
+    # SINR per stream (diagonal elements after ZF)
+    diagonal_elements = tf.linalg.diag_part(H_eff)
+    sinr_values = tf.cast(tf.abs(diagonal_elements) ** 2, tf.float32)
+    
+    sinr_db = 10 * tf.math.log10(sinr_values + 1e-10)
+    sinr_db = tf.clip_by_value(sinr_db, -50.0, 50.0)  # CRITICAL: Clip
+    
+    # Count streams where SINR > threshold
+    num_streams = tf.reduce_sum(tf.cast(sinr_values > 1e-3, tf.int32))
+    
+    return sinr_db, num_streams
+
 def zero_forcing_beamforming(H):
     """Zero Forcing beamforming for multi-stream transmission"""
     try:
-        W = zero_forcing_precoding(H)
-        
-        # Effective channel after ZF
-        H_eff = tf.matmul(H, W)
-        
-        # SINR per stream (diagonal elements after ZF)
-        diagonal_elements = tf.linalg.diag_part(H_eff)
-        sinr_values = tf.cast(tf.abs(diagonal_elements) ** 2, tf.float32)
-        
-        sinr_db = 10 * tf.math.log10(sinr_values + 1e-10)
-        sinr_db = tf.clip_by_value(sinr_db, -50.0, 50.0)  # CRITICAL: Clip
-        
-        # Count streams where SINR > threshold
-        num_streams = tf.reduce_sum(tf.cast(sinr_values > 1e-3, tf.int32))
-        
-        return sinr_db, num_streams
+        return _zero_forcing_sinr_kernel(H)
         
     except Exception as e:
         print(f"Zero Forcing error: {e}")
@@ -198,25 +249,20 @@ def get_physical_metrics(paths, bandwidth):
     Uses: P_rx = sum(|a_l|^2) where a_l are path gains
     """
     try:
-        cir_result = paths.cir()
+        cir_result = paths.cir(out_type="tf")
         # cir() returns tuple (a, tau) but handle both cases
         if isinstance(cir_result, (list, tuple)):
             a = cir_result[0]
         else:
             a = cir_result
         
-        # Convert to numpy
-        if hasattr(a, 'numpy'):
-            a_np = a.numpy()
-        else:
-            a_np = np.array(a)
-        
         # Total received power across all paths, RX and TX antennas
-        power_rx_lin = np.sum(np.abs(a_np) ** 2)
+        # |a|^2 fused into the reduction on device: only the scalar is copied to host
+        power_rx_lin = float(tf.reduce_sum(tf.math.real(a * tf.math.conj(a))))
         
         # Equivalent path loss: PL = TX_dBm - RX_dBm
         # This is derived from RT-simulated received power, not a model
-        tx_power_dbm = 35.0  # 5G typical TX power
+        tx_power_dbm = TX_POWER_DBM
         power_rx_dbm = 10 * np.log10(power_rx_lin + 1e-12)
         path_loss_db = tx_power_dbm - power_rx_dbm
         
@@ -227,19 +273,22 @@ def get_physical_metrics(paths, bandwidth):
         
     except Exception as e:
         print(f"Path loss calc error: {e}")
-        return 100.0, 1e-6
+        return np.nan, np.nan
 
-def calculate_thermal_noise(bandwidth, nf_db=7.0, temp_k=290):
+def calculate_thermal_noise(bandwidth, nf_db=NOISE_FIGURE_DB, temp_k=NOISE_TEMP_K):
     """
     Thermal noise power: N = k*T*B*NF
     k = Boltzmann constant = 1.38e-23 J/K
     T = Temperature (K)
     B = Bandwidth (Hz)
     NF = Noise Figure (linear scale)
+    
+    Returns the precomputed _THERMAL_NOISE_DEFAULT for the default RF config
     """
-    k_boltzmann = 1.38064852e-23
+    if bandwidth == RFNR_Config.BANDWIDTH and nf_db == NOISE_FIGURE_DB and temp_k == NOISE_TEMP_K:
+        return _THERMAL_NOISE_DEFAULT
     nf_linear = 10 ** (nf_db / 10)
-    noise_power = k_boltzmann * temp_k * bandwidth * nf_linear
+    noise_power = _K_BOLTZMANN * temp_k * bandwidth * nf_linear
     return noise_power
 
 def calculate_sinr_with_noise(channel_gains, noise_power, tx_power_w, num_streams):
@@ -256,35 +305,25 @@ def calculate_sinr_with_noise(channel_gains, noise_power, tx_power_w, num_stream
     
     IMPORTANTE: normalize=False en CFR para que σ² tenga unidades de potencia
     """
-    channel_gains = np.array(channel_gains)
-    
-    # Clip singular values para evitar overflow
-    channel_gains = np.clip(channel_gains, 0, 1e3)
+    channel_gains = np.asarray(channel_gains)
     
-    # Potencia por stream
-    tx_power_per_stream = tx_power_w / num_streams
-    
-    # Ecuación física correcta (con unidades coherentes)
-    signal_power = tx_power_per_stream * (channel_gains ** 2)
-    
-    sinr_linear = signal_power / (noise_power + 1e-15)
-    sinr_db = 10 * np.log10(sinr_linear + 1e-12)
+    # Ecuación física correcta (con unidades coherentes), en una sola expresión:
+    # potencia por stream * |σ_i|² / N  (σ_i >= 0 por ser valores singulares)
+    sinr_db = 10 * np.log10((tx_power_w / num_streams) * channel_gains * channel_gains
+                            / (noise_power + 1e-15) + 1e-12)
     
     # NO clipear: dejar que el canal determine el SINR
     return sinr_db
 
-def calculate_throughput(sinr_db_array, bandwidth=20e6):
-    """
-    Calculate throughput from SINR using Shannon capacity
-    For SVD multi-stream: SUM capacities across streams
-    
-    Shannon capacity per stream: C_i = B * log2(1 + SINR_i)
-    Total: C_total = sum(C_i) * BW
-    """
-    sinr_linear = tf.pow(10.0, sinr_db_array / 10.0)
+@tf.function(jit_compile=True, input_signature=[tf.TensorSpec([None], tf.float32),
+                                                tf.TensorSpec([], tf.float32)])
+def _throughput_kernel(sinr_db_array, bandwidth):
+    """Shannon sum-rate over streams, compiled once and reused for every height"""
+    sinr_linear = tf.exp(sinr_db_array * _DB_TO_LN)
     
     # Shannon capacity per stream (NO artificial cap - let physics work)
-    capacity_per_stream = tf.math.log(1.0 + sinr_linear) / tf.math.log(2.0)
+    # log1p: one transcendental per stream, accurate at low SINR
+    capacity_per_stream = tf.math.log1p(sinr_linear) * _LOG2_INV
     
     # SUM capacities across all streams (proper MIMO gain)
     total_capacity = tf.reduce_sum(capacity_per_stream)
@@ -294,6 +333,40 @@ def calculate_throughput(sinr_db_array, bandwidth=20e6):
     
     return throughput
 
+def calculate_throughput(sinr_db_array, bandwidth=20e6):
+    """
+    Calculate throughput from SINR using Shannon capacity
+    For SVD multi-stream: SUM capacities across streams
+    
+    Shannon capacity per stream: C_i = B * log2(1 + SINR_i)
+    Total: C_total = sum(C_i) * BW
+    """
+    return _throughput_kernel(tf.reshape(tf.cast(sinr_db_array, tf.float32), [-1]),
+                              tf.constant(bandwidth, tf.float32))
+
+# Per-height kernels: everything after the channel extraction (SINR per stream,
+# mean SINR and Shannon throughput) in one XLA graph, compiled once for the sweep
+@tf.function(jit_compile=True, input_signature=[tf.TensorSpec([None], tf.float32),
+                                                tf.TensorSpec([], tf.float32),
+                                                tf.TensorSpec([], tf.float32),
+                                                tf.TensorSpec([], tf.float32)])
+def _svd_height_kernel(sigma2_norm, power_rx_lin, noise_power, bandwidth):
+    """SVD: global SNR from the CIR power, split across streams by sigma2_norm"""
+    # 10*log10(x) = ln(x) / _DB_TO_LN
+    snr_db_global = tf.math.log(power_rx_lin / (noise_power + 1e-15) + 1e-12) / _DB_TO_LN
+    sinr_db_svd = snr_db_global + tf.math.log(sigma2_norm + 1e-12) / _DB_TO_LN
+    throughput = _throughput_kernel(sinr_db_svd, bandwidth)
+    return tf.reduce_mean(sinr_db_svd), throughput
+
+@tf.function(jit_compile=True, input_signature=[_H_SPEC, tf.TensorSpec([], tf.float32)])
+def _zf_height_kernel(H, bandwidth):
+    """ZF: precoding, per-stream SINR and throughput"""
+    sinr_db_zf, _ = _zero_forcing_sinr_kernel(H)
+    throughput = _throughput_kernel(sinr_db_zf, bandwidth)
+    return tf.reduce_mean(sinr_db_zf), throughput
+
+_RENDER_CAMERA = None  # Reused by render_scene_3d
+
 def render_scene_3d(scene, tx, rx, paths, title="", return_image=False, num_samples=64):
     """
     Render 3D scene with ray tracing visualization
@@ -321,27 +394,29 @@ def render_scene_3d(scene, tx, rx, paths, title="", return_image=False, num_samp
         cam_height = rx_height + 200  # Camera 200m above UAV for good perspective
         cam_pos = (tx_pos[0] + 200, tx_pos[1] + 30, cam_height)
         
-        # Create camera
-        cam = Camera(position=cam_pos)
+        # Camera shared across renders (renders are sequential): move it instead of
+        # creating a new Mitsuba camera per height
+        global _RENDER_CAMERA
+        if _RENDER_CAMERA is None:
+            _RENDER_CAMERA = Camera(position=cam_pos)
+        cam = _RENDER_CAMERA
+        cam.position = cam_pos
         cam.look_at(tx)
         
         # Render scene - returns Mitsuba Bitmap
         bitmap = scene.render(camera=cam, paths=paths, return_bitmap=True, num_samples=num_samples)
         
-        # Convert Mitsuba bitmap to numpy array [H, W, channels]
-        img = np.array(bitmap)  # Usually [H, W, 3] or [H, W, 4]
+        # Mitsuba bitmap as numpy array [H, W, channels], usually [H, W, 3] or [H, W, 4]
+        # Drop alpha channel first (view, no copy) so only RGB gets converted
+        img = np.asarray(bitmap)[..., :3]  # [H, W, 3]
         
         # Ensure proper dtype for imshow - matplotlib works best with uint8
         if img.dtype != np.uint8:
-            # If float, convert to 0-255 range
+            # If float, convert to 0-255 range: one float buffer scaled in place + the uint8 cast
             if np.issubdtype(img.dtype, np.floating):
-                img = (np.clip(img, 0, 1) * 255).astype(np.uint8)
-            else:
-                img = img.astype(np.uint8)
-        
-        # Drop alpha channel if present, keep only RGB
-        if img.shape[2] == 4:
-            img = img[:, :, :3]  # [H, W, 3]
+                img = np.clip(img, 0, 1)
+                img *= 255
+            img = img.astype(np.uint8)
         
         if return_image:
             return img
@@ -364,7 +439,8 @@ def render_scene_3d(scene, tx, rx, paths, title="", return_image=False, num_samp
 ########################################
 
 def run_height_analysis(mimo_config_name="MIMO_4x4", beamforming_technique="SVD", 
-                       num_heights=5, height_min=20, height_max=150):
+                       num_heights=5, height_min=20, height_max=150,
+                       max_renders=None, render_samples=None):
     """
     Run height analysis for UAV communications
     
@@ -373,6 +449,9 @@ def run_height_analysis(mimo_config_name="MIMO_4x4", beamforming_technique="SVD"
         beamforming_technique: "SVD" or "ZF"
         num_heights: Number of height points to analyze
         height_min, height_max: Height range in meters
+        max_renders: Number of evenly spaced heights to render; the other heights
+                     reuse the nearest render (None = render every height)
+        render_samples: Samples per pixel for the renders (None = 64, 16 above 120m)
     
     Returns:
         results dict with height analysis data
@@ -424,33 +503,62 @@ def run_height_analysis(mimo_config_name="MIMO_4x4", beamforming_technique="SVD"
     scene.add(tx)
     
     # Initialize results storage
+    # Arrays preallocated per height (indexed by i), written in place during the sweep;
+    # heights that fail keep NaN (no magic numbers in plots/statistics)
     results = {
         'heights': heights,
-        'throughput_mbps': [],
-        'path_loss_db': [],
-        'snr_db': [],
-        'channel_gain_db': [],
-        'los_condition': [],
-        'renders': []  # Usar lista indexada por i, no por altura (evita problemas de floats)
+        'throughput_mbps': np.full(num_heights, np.nan, dtype=np.float32),
+        'path_loss_db': np.full(num_heights, np.nan, dtype=np.float32),
+        'snr_db': np.full(num_heights, np.nan, dtype=np.float32),
+        'channel_gain_db': np.full(num_heights, np.nan, dtype=np.float32),
+        'los_condition': np.empty(num_heights, dtype='U5'),  # 'LoS', 'NLoS', 'None', 'Error'
+        'renders': [None] * num_heights  # Usar lista indexada por i, no por altura (evita problemas de floats)
     }
     
-    # Analyze each height
+    # Only a subset of heights is rendered; the rest reuse the nearest render.
+    # Renders stay on this thread: Mitsuba/Dr.Jit plugins are registered per thread
+    if max_renders is None:
+        render_idx = set(range(num_heights))
+    else:
+        render_idx = set(np.round(np.linspace(0, num_heights - 1, max_renders)).astype(int).tolist())
+    rendered = []
+    render_reuse = []  # Traced heights that take the nearest render
+    
+    # Create frequency range for 5G NR: H is the mean over every subcarrier (a coarser
+    # grid aliases multipath delays above 1/spacing). The CFR is evaluated in chunks of
+    # CFR_CHUNK_SUBCARRIERS, so no subcarrier cut is needed at high altitudes
+    carrier_frequency = RFNR_Config.CARRIER_FREQUENCY
+    num_subcarriers = RFNR_Config.NUM_SUBCARRIERS
+    subcarrier_spacing = RFNR_Config.SUBCARRIER_SPACING
+    
+    frequencies = tf.linspace(
+        carrier_frequency - (num_subcarriers//2) * subcarrier_spacing,
+        carrier_frequency + (num_subcarriers//2 - 1) * subcarrier_spacing,
+        num_subcarriers
+    )
+    chunk = RFNR_Config.CFR_CHUNK_SUBCARRIERS
+    frequency_chunks = [frequencies[j:j + chunk] for j in range(0, num_subcarriers, chunk)]
+    
+    # Ray tracing pass: one receiver at a time, with the TX aimed at it (the tr38901
+    # array is directional, so every height needs its own trace). Only H, the CIR
+    # power and the LoS flag are kept, so the SVD can then run once for all heights
+    H_list = [None] * num_heights
+    H_errors = [None] * num_heights
+    no_paths = np.zeros(num_heights, dtype=bool)
+    path_loss_list = np.full(num_heights, np.nan)
+    power_rx_list = np.full(num_heights, np.nan)
+    los_list = [None] * num_heights
     rx = None  # Track current RX to remove later
     
     for i, height in enumerate(heights):
-        print(f"\n[{i+1}/{num_heights}] Height: {height:.1f}m", end=" ")
-        
         try:
             # Remove previous RX if it exists
             if rx is not None:
                 scene.remove(rx.name)
             
-            # Set UAV position
-            uav_pos = np.concatenate([uav_2d_pos, np.array([height])])
-            
             # Create new receiver with unique name per iteration
-            rx_name = f"UAV_{i}"
-            rx = Receiver(name=rx_name, position=uav_pos)
+            uav_pos = np.array([uav_2d_pos[0], uav_2d_pos[1], height], dtype=np.float32)
+            rx = Receiver(name=f"UAV_{i}", position=uav_pos)
             scene.add(rx)
             
             # Make TX look at RX
@@ -460,86 +568,104 @@ def run_height_analysis(mimo_config_name="MIMO_4x4", beamforming_technique="SVD"
             paths = PathSolver()(scene)
             
             if paths is None:
-                print("⚠ No paths found")
-                results['throughput_mbps'].append(100.0)
-                results['path_loss_db'].append(140.0)
-                results['snr_db'].append(-20.0)
-                results['channel_gain_db'].append(-140.0)
-                results['los_condition'].append('None')
-                results['renders'].append(None)
+                no_paths[i] = True
                 continue
             
-            # Extract channel matrix using CFR at multiple frequencies
+            # Get channel frequency response, one chunk of subcarriers at a time
+            # [num_rx=1, num_rx_ant, num_tx=1, num_tx_ant, num_time_steps, chunk]
+            # MODELO B (físico): normalize=False para consistencia de unidades
+            # H contendrá path loss, fading y array gain reales
+            H_sum = 0
+            for freqs in frequency_chunks:
+                cfr = paths.cfr(frequencies=freqs, normalize=False, out_type="tf")
+                H_sum += tf.reduce_sum(cfr[0, :, 0, :, 0, :], axis=-1)
+                del cfr
+            # Band mean kept in complex64: with normalize=False the gains are far
+            # below the float16 range and bfloat16 loses too much mantissa for the SVD
+            H_list[i] = tf.cast(H_sum / tf.cast(num_subcarriers, H_sum.dtype), tf.complex64)
+            
+            #  CORRECTO: Obtener path loss desde paths CIR, no desde H
+            path_loss_list[i], power_rx_list[i] = get_physical_metrics(paths, RFNR_Config.BANDWIDTH)
+            
+            # Determine LoS
+            los_list[i] = 'LoS' if hasattr(paths, 'los') and paths.los else 'NLoS'
+            
+            # Capture render while the scene holds this height - reduce samples for high altitudes
+            if i in render_idx:
+                print(f"\n[{i+1}/{num_heights}] Capturing 3D render...", end="")
+                # Use fewer samples at extreme heights to avoid GPU memory exhaustion
+                num_render_samples = render_samples or (16 if height > 120 else 64)
+                scene_3d_image = render_scene_3d(scene, tx, rx, paths,
+                                                 title=f"Height: {height:.0f}m",
+                                                 return_image=True,
+                                                 num_samples=num_render_samples)
+                results['renders'][i] = scene_3d_image
+                if scene_3d_image is not None:
+                    rendered.append(i)
+                    print(f" ✓ Captured ({scene_3d_image.shape[1]}×{scene_3d_image.shape[0]})")
+                else:
+                    print(f" ✗ Failed")
+            else:
+                render_reuse.append(i)
+        except Exception as e:
+            H_list[i] = None
+            H_errors[i] = e
+    print()
+    
+    # SVD of every valid height in one batched call; the modal power split
+    # (sigma2_norm) only depends on the singular values, so it is vectorized too
+    sigma2_norm_batch = {}
+    if beamforming_technique == "SVD":
+        valid_idx = [i for i, H in enumerate(H_list) if H is not None]
+        if valid_idx:
             try:
-                # Create frequency range for 5G NR
-                carrier_frequency = RFNR_Config.CARRIER_FREQUENCY
-                bandwidth = RFNR_Config.BANDWIDTH
-                num_subcarriers = RFNR_Config.NUM_SUBCARRIERS
-                
-                # Reduce subcarriers at extreme heights to avoid GPU exhaustion
-                if height > 110:
-                    num_subcarriers = 256  # Reduce from 1333 to avoid GPU memory exhaustion
-                
-                subcarrier_spacing = RFNR_Config.SUBCARRIER_SPACING
-                
-                frequencies = tf.linspace(
-                    carrier_frequency - (num_subcarriers//2) * subcarrier_spacing,
-                    carrier_frequency + (num_subcarriers//2 - 1) * subcarrier_spacing,
-                    num_subcarriers
+                _, _, _, _, S_active = svd_multistream_beamforming_batch(
+                    np.stack([H_list[i].numpy() for i in valid_idx]),
+                    config.max_layers, beamforming_rank=None  # Spatial multiplexing
                 )
+                # Repartir potencia proporcional por stream (ganancia modal relativa)
+                # IMPORTANTE: Normalizar sigma para evitar overflow
+                sigma_norm = S_active / (np.max(S_active, axis=-1, keepdims=True) + 1e-12)
+                sigma2_norm = (sigma_norm ** 2) / (np.sum(sigma_norm ** 2, axis=-1, keepdims=True) + 1e-12)
+                sigma2_norm_batch = dict(zip(valid_idx, sigma2_norm))
+            except Exception as e:
+                print(f"SVD error: {e}")
+                traceback.print_exc()
+    
+    # Scalar kernel inputs, identical for every height (ruido térmico físico)
+    noise_power_tf = tf.constant(_THERMAL_NOISE_DEFAULT, tf.float32)
+    bandwidth_tf = tf.constant(RFNR_Config.BANDWIDTH, tf.float32)
+    
+    # Analyze each height
+    for i, height in enumerate(heights):
+        print(f"\n[{i+1}/{num_heights}] Height: {height:.1f}m", end=" ")
+        
+        try:
+            if no_paths[i]:
+                print("⚠ No paths found")
+                results['los_condition'][i] = 'None'
+                continue
+            
+            try:
+                if H_errors[i] is not None:
+                    raise H_errors[i]
                 
-                # Get channel frequency response
-                # MODELO B (físico): normalize=False para consistencia de unidades
-                # H contendrá path loss, fading y array gain reales
-                cfr = paths.cfr(frequencies=frequencies, normalize=False, out_type="tf")
-                
-                # Extract channel matrix for first subcarrier
-                #H = cfr[0, :, :, 0]  # [num_rx, num_tx]
-                H = tf.reduce_mean(cfr[:, :, :, 0], axis=0)
-                H = tf.cast(H, tf.complex64)
-                
-                #  CORRECTO: Obtener path loss desde paths CIR, no desde H
-                path_loss_db, power_rx_lin = get_physical_metrics(paths, RFNR_Config.BANDWIDTH)
-
-                
-                #  CORRECTO: Calcular ruido térmico físico
-                noise_power = calculate_thermal_noise(RFNR_Config.BANDWIDTH, nf_db=7.0)
-                
-                #  TX power REAL en watts (necesario para Modelo B físico)
-                tx_power_dbm = 35.0  # 5G typical
-                tx_power_w = 10 ** ((tx_power_dbm - 30) / 10)  # Convert dBm to watts
-                
+                H = H_list[i]
+                path_loss_db, power_rx_lin = path_loss_list[i], power_rx_list[i]
                 
                 # Beamforming + SINR con ruido físico
                 if beamforming_technique == "SVD":
-                    V, S_all, U, valid_streams, S_active = svd_multistream_beamforming(
-                        H, config.max_layers, beamforming_rank=None  # Spatial multiplexing
-                    )
-                    
                     #  CORRECCIÓN: SNR FÍSICO desde power_rx_lin (del CIR, no desde H)
                     # power_rx_lin es la potencia recibida REAL del ray tracing
                     # Los valores singulares SOLO reparten esa potencia entre streams
-                    snr_linear_global = power_rx_lin / (noise_power + 1e-15)
-                    snr_db_global = 10 * np.log10(snr_linear_global + 1e-12)
-                    
-                    # Repartir potencia proporcional por stream (ganancia modal relativa)
-                    # IMPORTANTE: Normalizar sigma para evitar overflow
-                    sigma_norm = S_active / (np.max(S_active) + 1e-12)
-                    sigma2_norm = (sigma_norm ** 2) / (np.sum(sigma_norm ** 2) + 1e-12)
-                    
-                    # SINR por stream = SNR global + redistribución modal
-                    # ESTO ES CORRECTO FÍSICAMENTE: no creas potencia, solo reparte la que hay
-                    sinr_db_svd = snr_db_global + 10 * np.log10(sigma2_norm + 1e-12)
-                    sinr_db = np.mean(sinr_db_svd)
-                    
-                    #  Throughput suma streams correctamente
-                    throughput = calculate_throughput(tf.constant(sinr_db_svd, dtype=tf.float32), 
-                                                     bandwidth=RFNR_Config.BANDWIDTH).numpy() / 1e6
+                    # (SINR por stream = SNR global + redistribución modal; throughput suma streams)
+                    sinr_db, throughput = _svd_height_kernel(
+                        tf.constant(sigma2_norm_batch[i], dtype=tf.float32),
+                        tf.constant(power_rx_lin, tf.float32), noise_power_tf, bandwidth_tf)
                 else:  # ZF
-                    sinr_db_zf, num_streams_zf = zero_forcing_beamforming(H)
-                    sinr_db = tf.reduce_mean(sinr_db_zf).numpy()
-                    throughput = calculate_throughput(sinr_db_zf, 
-                                                     bandwidth=RFNR_Config.BANDWIDTH).numpy() / 1e6
+                    sinr_db, throughput = _zf_height_kernel(H, bandwidth_tf)
+                sinr_db = float(sinr_db)
+                throughput = float(throughput) / 1e6
                 
                 #  ELIMINADO: Umbral artificial que mata la física
                 # El throughput debe decaer suavemente con path loss, no de golpe a cero
@@ -548,59 +674,29 @@ def run_height_analysis(mimo_config_name="MIMO_4x4", beamforming_technique="SVD"
                 snr_db = sinr_db
                 channel_gain_db = -path_loss_db
                 
-                # Determine LoS
-                los_condition = 'LoS' if hasattr(paths, 'los') and paths.los else 'NLoS'
+                los_condition = los_list[i]
                 
-                # Capture render - reduce samples for high altitudes to avoid GPU exhaustion
-                try:
-                    print(f"   Capturing 3D render...", end="")
-                    # Use fewer samples at extreme heights to avoid GPU memory exhaustion
-                    num_render_samples = 16 if height > 120 else 64
-                    scene_3d_image = render_scene_3d(scene, tx, rx, paths, 
-                                                     title=f"Height: {height:.0f}m, Throughput: {throughput:.0f} Mbps",
-                                                     return_image=True,
-                                                     num_samples=num_render_samples)
-                    results['renders'].append(scene_3d_image)
-                    if scene_3d_image is not None:
-                        print(f" ✓ Captured ({scene_3d_image.shape[1]}×{scene_3d_image.shape[0]})")
-                    else:
-                        print(f" ✗ Failed")
-                except Exception as e:
-                    print(f" ✗ Error: {str(e)[:50]}")
-                    results['renders'].append(None)
-                
-
-                results['throughput_mbps'].append(throughput)
-                results['path_loss_db'].append(path_loss_db)
-                results['snr_db'].append(snr_db)
-                results['channel_gain_db'].append(channel_gain_db)
-                results['los_condition'].append(los_condition)
+                results['throughput_mbps'][i] = throughput
+                results['path_loss_db'][i] = path_loss_db
+                results['snr_db'][i] = snr_db
+                results['channel_gain_db'][i] = channel_gain_db
+                results['los_condition'][i] = los_condition
                 
                 print(f"✓ {throughput:.0f} Mbps, PL={path_loss_db:.1f}dB, SNR={snr_db:.1f}dB ({los_condition})")
                 
             except Exception as e:
                 print(f"Channel extraction error: {e}")
-                results['throughput_mbps'].append(100.0)
-                results['path_loss_db'].append(140.0)
-                results['snr_db'].append(-20.0)
-                results['channel_gain_db'].append(-140.0)
-                results['los_condition'].append('Error')
-                results['renders'].append(None)
+                results['los_condition'][i] = 'Error'
                 
         except Exception as e:
             print(f"Error at height {height}: {e}")
-            results['throughput_mbps'].append(100.0)
-            results['path_loss_db'].append(140.0)
-            results['snr_db'].append(-20.0)
-            results['channel_gain_db'].append(-140.0)
-            results['los_condition'].append('Error')
-            results['renders'].append(None)
-    
-    # Convert to numpy arrays
-    results['throughput_mbps'] = np.array(results['throughput_mbps'])
-    results['path_loss_db'] = np.array(results['path_loss_db'])
-    results['snr_db'] = np.array(results['snr_db'])
-    results['channel_gain_db'] = np.array(results['channel_gain_db'])
+            results['los_condition'][i] = 'Error'
+    
+    # Heights without their own render reuse the nearest captured one
+    if rendered:
+        for i in render_reuse:
+            nearest = min(rendered, key=lambda j: abs(heights[j] - heights[i]))
+            results['renders'][i] = results['renders'][nearest]
     
     return results
 
@@ -630,17 +726,19 @@ def plot_height_analysis(results, mimo_config_name, beamforming_technique):
     ax1.tick_params(axis='y', labelcolor=color1)
     ax1.grid(True, alpha=0.3)
     
-    # Highlight optimal height
-    opt_idx = np.argmax(throughput)
-    opt_height = heights[opt_idx]
-    opt_throughput = throughput[opt_idx]
-    ax1.scatter([opt_height], [opt_throughput], color='red', s=300, marker='*', 
-               zorder=5, edgecolors='darkred', linewidth=2)
-    ax1.annotate(f'Optimal: {opt_height:.0f}m\n{opt_throughput:.0f} Mbps',
-                xy=(opt_height, opt_throughput), xytext=(10, 10),
-                textcoords='offset points', fontsize=11, fontweight='bold',
-                bbox=dict(boxstyle='round,pad=0.5', facecolor='yellow', alpha=0.8),
-                arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0', color='red'))
+    # Highlight optimal height (failed heights are NaN and never win)
+    valid = ~np.isnan(throughput)
+    if valid.any():
+        opt_idx = np.flatnonzero(valid)[np.argmax(throughput[valid])]
+        opt_height = heights[opt_idx]
+        opt_throughput = throughput[opt_idx]
+        ax1.scatter([opt_height], [opt_throughput], color='red', s=300, marker='*', 
+                   zorder=5, edgecolors='darkred', linewidth=2)
+        ax1.annotate(f'Optimal: {opt_height:.0f}m\n{opt_throughput:.0f} Mbps',
+                    xy=(opt_height, opt_throughput), xytext=(10, 10),
+                    textcoords='offset points', fontsize=11, fontweight='bold',
+                    bbox=dict(boxstyle='round,pad=0.5', facecolor='yellow', alpha=0.8),
+                    arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0', color='red'))
     
     # Plot 2: Path Loss (right axis)
     ax2 = ax1.twinx()
@@ -692,7 +790,8 @@ def plot_height_analysis(results, mimo_config_name, beamforming_technique):
 def plot_height_renders_grid(results, mimo_config_name, beamforming_technique):
     """
     Generate grid of 3D renders at each height
-    Matches mimo_beam.py exactly: imshow() → set_title() → axis('off')
+    All renders are tiled into one canvas and drawn with a single imshow();
+    titles and placeholders are text on that same axes (no subplot per height)
     """
     heights = results['heights']
     renders = results['renders']  # Lista con imágenes numpy uint8 [H, W, 3]
@@ -707,39 +806,58 @@ def plot_height_renders_grid(results, mimo_config_name, beamforming_technique):
         rows = 2
         cols = (num_heights + 1) // 2
     
+    # Valid renders: uint8-convertible [H, W, >=3] arrays
+    valid = [isinstance(img, np.ndarray) and img.ndim == 3 and img.shape[2] >= 3 and img.size > 0
+             for img in renders]
+    tile_shapes = [img.shape[:2] for img, ok in zip(renders, valid) if ok]
+    tile_h, tile_w = max(tile_shapes) if tile_shapes else (180, 300)
+    title_h = max(tile_h // 8, 1)  # Band above each tile for its title
+    cell_h = title_h + tile_h
+    
+    # White canvas, one contiguous copy per tile (resized only if its size differs)
+    canvas = np.full((rows * cell_h, cols * tile_w, 3), 255, dtype=np.uint8)
+    
     fig = plt.figure(figsize=(6*cols, 5*rows))
+    ax = fig.add_subplot(111)
     
     for i, height in enumerate(heights):
-        ax = plt.subplot(rows, cols, i+1)
+        r, c = divmod(i, cols)
+        y0, x0 = r * cell_h + title_h, c * tile_w
+        x_mid, y_mid = x0 + tile_w / 2, y0 + tile_h / 2
+        y_title = r * cell_h + title_h / 2
         
         img = renders[i]  # Get render by index from list [H, W, 3]
         
-        # EXACTLY like mimo_beam.py: imshow first, then set_title, then axis('off')
-        if img is not None and isinstance(img, np.ndarray) and img.size > 0:
-            # Validate image
-            if len(img.shape) == 3 and img.shape[2] >= 3:
-                try:
-                    ax.imshow(img)  # Display the render image [H, W, 3] uint8
-                    tp_val = throughputs[i]
-                    pl_val = path_losses[i]
-                    ax.set_title(f'Height: {height:.0f}m | TP: {tp_val:.0f} Mbps | PL: {pl_val:.1f} dB',
-                                fontsize=11, fontweight='bold', color='darkblue')
-                except Exception as e:
-                    ax.text(0.5, 0.5, f'Display Error:\n{str(e)[:40]}', 
-                           ha='center', va='center', fontsize=10, color='red', transform=ax.transAxes)
-                    ax.set_title(f'Height: {height:.0f}m (Error)', fontsize=11, fontweight='bold', color='red')
-            else:
-                # Invalid image shape
-                ax.text(0.5, 0.5, f'Invalid Image\nShape: {img.shape}', 
-                       ha='center', va='center', fontsize=10, color='red', transform=ax.transAxes)
-                ax.set_title(f'Height: {height:.0f}m (Invalid)', fontsize=11, fontweight='bold', color='red')
+        if valid[i]:
+            try:
+                tile = img[..., :3].astype(np.uint8, copy=False)
+                if tile.shape[:2] != (tile_h, tile_w):
+                    tile = np.asarray(Image.fromarray(tile).resize((tile_w, tile_h)))
+                canvas[y0:y0 + tile_h, x0:x0 + tile_w] = tile
+                tp_val = throughputs[i]
+                pl_val = path_losses[i]
+                ax.text(x_mid, y_title, f'Height: {height:.0f}m | TP: {tp_val:.0f} Mbps | PL: {pl_val:.1f} dB',
+                        ha='center', va='center', fontsize=11, fontweight='bold', color='darkblue')
+            except Exception as e:
+                ax.text(x_mid, y_mid, f'Display Error:\n{str(e)[:40]}',
+                        ha='center', va='center', fontsize=10, color='red')
+                ax.text(x_mid, y_title, f'Height: {height:.0f}m (Error)',
+                        ha='center', va='center', fontsize=11, fontweight='bold', color='red')
+        elif isinstance(img, np.ndarray) and img.size > 0:
+            # Invalid image shape
+            ax.text(x_mid, y_mid, f'Invalid Image\nShape: {img.shape}',
+                    ha='center', va='center', fontsize=10, color='red')
+            ax.text(x_mid, y_title, f'Height: {height:.0f}m (Invalid)',
+                    ha='center', va='center', fontsize=11, fontweight='bold', color='red')
         else:
             # Fallback: show text placeholder
-            ax.text(0.5, 0.5, f'No Render\nHeight: {height:.0f}m', 
-                   ha='center', va='center', fontsize=12, color='red', transform=ax.transAxes)
-            ax.set_title(f'Height: {height:.0f}m (Not Captured)', fontsize=11, fontweight='bold', color='red')
-        
-        ax.axis('off')  # Turn off axis AFTER imshow()
+            ax.text(x_mid, y_mid, f'No Render\nHeight: {height:.0f}m',
+                    ha='center', va='center', fontsize=12, color='red')
+            ax.text(x_mid, y_title, f'Height: {height:.0f}m (Not Captured)',
+                    ha='center', va='center', fontsize=11, fontweight='bold', color='red')
+    
+    ax.imshow(canvas)  # Single blit for the whole grid
+    ax.axis('off')
     
     fig.suptitle(f'3D Ray Tracing Renders - {mimo_config_name} ({beamforming_technique})',
                 fontsize=14, fontweight='bold', y=0.98)
@@ -748,6 +866,46 @@ def plot_height_renders_grid(results, mimo_config_name, beamforming_technique):
     
     return fig
 
+########################################
+# SUMMARY
+########################################
+
+def _summ_loop(a):
+    """
+    Single pass over a 1-D array: (min, max, argmax, sum, count) of the non-NaN
+    values (NaN = failed height). argmax is -1 if every value is NaN
+    """
+    v_min = np.inf
+    v_max = -np.inf
+    i_max = -1
+    total = 0.0
+    count = 0
+    for i in range(a.shape[0]):
+        x = a[i]
+        if x != x:  # NaN
+            continue
+        if x < v_min:
+            v_min = x
+        if x > v_max or i_max < 0:
+            v_max = x
+            i_max = i
+        total += x
+        count += 1
+    return v_min, v_max, i_max, total, count
+
+if NUMBA_AVAILABLE:
+    # No fastmath: it assumes no NaNs and would drop the NaN check
+    _summ = njit(cache=True)(_summ_loop)
+else:
+    def _summ(a):
+        """Versión NumPy de _summ (sin numba)"""
+        valid = ~np.isnan(a)
+        if not valid.any():
+            return np.inf, -np.inf, -1, 0.0, 0
+        idx = np.flatnonzero(valid)
+        i_max = idx[np.argmax(a[valid])]
+        return np.min(a[valid]), a[i_max], i_max, np.sum(a[valid]), idx.size
+
 ########################################
 # MAIN EXECUTION
 ########################################
@@ -759,6 +917,8 @@ if __name__ == "__main__":
     NUM_HEIGHTS = 5
     HEIGHT_MIN = 14
     HEIGHT_MAX = 120  # Reduced from 150 to avoid GPU memory exhaustion at extreme heights
+    MAX_RENDERS = 3      # Rendered heights; the rest reuse the nearest render
+    RENDER_SAMPLES = 8   # Enough for the thumbnail grid
     
     print(f"\n{'#'*70}")
     print(f"# 5G NR MIMO UAV HEIGHT ANALYSIS")
@@ -773,7 +933,9 @@ if __name__ == "__main__":
                                  beamforming_technique=BEAMFORMING,
                                  num_heights=NUM_HEIGHTS,
                                  height_min=HEIGHT_MIN,
-                                 height_max=HEIGHT_MAX)
+                                 height_max=HEIGHT_MAX,
+                                 max_renders=MAX_RENDERS,
+                                 render_samples=RENDER_SAMPLES)
     
     if results is None:
         print("Height analysis failed!")
@@ -782,34 +944,44 @@ if __name__ == "__main__":
     # Generate plots
     print("\nGenerating visualizations...")
     
-    fig1 = plot_height_analysis(results, MIMO_CONFIG, BEAMFORMING)
-    output_file1 = f"height_analysis_{MIMO_CONFIG}_{BEAMFORMING}.png"
-    fig1.savefig(output_file1, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Saved: {output_file1}")
-    plt.show()
-    plt.close(fig1)
+    # PNG encoding runs on worker threads while the next figure is built; the tight
+    # bbox is computed once here so savefig does not render twice to find it
+    # (analysis plot is vector-heavy: 200 dpi; the raster renders grid: 150 dpi)
+    saves = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for build_fig, output_file, dpi in (
+                (plot_height_analysis, f"height_analysis_{MIMO_CONFIG}_{BEAMFORMING}.png", 200),
+                (plot_height_renders_grid, f"height_renders_{MIMO_CONFIG}_{BEAMFORMING}.png", 150)):
+            fig = build_fig(results, MIMO_CONFIG, BEAMFORMING)
+            fig.canvas.draw()
+            bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(0.1)
+            saves.append((fig, output_file, executor.submit(
+                fig.savefig, output_file, dpi=dpi, bbox_inches=bbox, facecolor='white',
+                pil_kwargs={'compress_level': 3})))
+        
+        for fig, output_file, future in saves:
+            future.result()
+            print(f"✓ Saved: {output_file}")
     
-    fig2 = plot_height_renders_grid(results, MIMO_CONFIG, BEAMFORMING)
-    output_file2 = f"height_renders_{MIMO_CONFIG}_{BEAMFORMING}.png"
-    fig2.savefig(output_file2, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"✓ Saved: {output_file2}")
     plt.show()
-    plt.close(fig2)
+    for fig, _, _ in saves:
+        plt.close(fig)
     
     # Summary
     print(f"\n{'='*70}")
     print("HEIGHT ANALYSIS SUMMARY")
     print(f"{'='*70}")
-    opt_idx = np.argmax(results['throughput_mbps'])
-    min_tp = np.min(results['throughput_mbps'])
-    max_tp = results['throughput_mbps'][opt_idx]
-    
-    print(f"Optimal height: {results['heights'][opt_idx]:.1f}m")
-    print(f"Max throughput: {max_tp:.1f} Mbps")
-    print(f"Min throughput: {min_tp:.1f} Mbps")
-    print(f"Avg throughput: {np.mean(results['throughput_mbps']):.1f} Mbps")
-    if min_tp > 0:
-        print(f"Throughput gain (max/min): {max_tp/min_tp:.2f}x")
-    else:
-        print(f"Throughput gain (max/min): Infinite (min=0)")
+    tp = np.ascontiguousarray(results['throughput_mbps'], dtype=np.float64)
+    min_tp, max_tp, opt_idx, sum_tp, num_valid = _summ(tp)  # One pass over the array
+    if num_valid > 0:
+        print(f"Optimal height: {results['heights'][opt_idx]:.1f}m")
+        print(f"Max throughput: {max_tp:.1f} Mbps")
+        print(f"Min throughput: {min_tp:.1f} Mbps")
+        print(f"Avg throughput: {sum_tp / num_valid:.1f} Mbps")
+        if min_tp > 0:
+            print(f"Throughput gain (max/min): {max_tp/min_tp:.2f}x")
+        else:
+            print(f"Throughput gain (max/min): Infinite (min=0)")
+    if num_valid < len(tp):
+        print(f"Failed heights: {len(tp) - num_valid}/{len(tp)}")
     print(f"{'='*70}\n")